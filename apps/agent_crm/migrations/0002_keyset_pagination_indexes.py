@@ -0,0 +1,29 @@
+# Generated by Django 5.1.7 on 2026-10-19 15:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("agent_crm", "0001_initial"),
+        ("properties", "0008_keyset_pagination_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="lead",
+            index=models.Index(
+                fields=["assigned_agent", "created_at", "id"],
+                name="lead_agent_created_at_id_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="lead",
+            index=models.Index(
+                fields=["created_at", "id"], name="lead_created_at_id_idx"
+            ),
+        ),
+    ]
@@ -27,6 +27,16 @@ class Lead(Audit):
     message = models.TextField()
     status = models.CharField(max_length=20, choices=LEAD_STATUS_CHOICES, default="new")
 
+    class Meta:
+        indexes = [
+            # Keyset pagination of an agent's leads and of all leads
+            models.Index(
+                fields=["assigned_agent", "created_at", "id"],
+                name="lead_agent_created_at_id_idx",
+            ),
+            models.Index(fields=["created_at", "id"], name="lead_created_at_id_idx"),
+        ]
+
     def save(self, *args, **kwargs):
         # If no agent is explicitly assigned, default to the property's owner.
         if (
@@ -2,11 +2,11 @@ from drf_spectacular.utils import extend_schema
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
-from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.filters import SearchFilter
 from rest_framework.permissions import IsAuthenticated
 
 from apps.properties.models import Property
-from services import CustomResponseMixin, EmailService
+from services import CustomResponseMixin, EmailService, KeysetPagination
 
 from ..models import Lead
 from .serializers import LeadSerializer
@@ -25,9 +25,16 @@ class LeadViewSet(
 
     serializer_class = LeadSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [SearchFilter, OrderingFilter]
+    filter_backends = [SearchFilter]
     search_fields = ["name", "email", "phone", "status"]
-    ordering_fields = ["created_at", "status"]
+    pagination_class = KeysetPagination
+    # Ordering is applied by the pagination, which seeks from page to page
+    keyset_orderings = {
+        "-created_at": ("-created_at", "-id"),
+        "created_at": ("created_at", "id"),
+        "status": ("status", "-created_at", "-id"),
+        "-status": ("-status", "-created_at", "-id"),
+    }
 
     @extend_schema(
         description="Retrieve a list of leads. Admins see all leads; agents see only assigned leads.",
@@ -41,9 +48,11 @@ class LeadViewSet(
         user = self.request.user
         if getattr(self, "swagger_fake_view", False):
             return Lead.objects.none()
+        # Leads of deleted properties disappear with the property
+        leads = Lead.objects.filter(property__deleted_at__isnull=True)
         if getattr(user, "is_admin", False):
-            return Lead.objects.all().order_by("-created_at")
-        return Lead.objects.filter(assigned_agent=user).order_by("-created_at")
+            return leads.order_by("-created_at")
+        return leads.filter(assigned_agent=user).order_by("-created_at")
 
     @swagger_auto_schema(
         operation_description="Create a new lead and assign it to the authenticated agent.",
@@ -1,11 +1,29 @@
 from django.contrib import admin
 
-from .models import PropertyChatHistory, PropertyEmbedding
+from .models import (
+    DocumentIngestionJob,
+    DocumentText,
+    EmbeddingGeneration,
+    PropertyChatHistory,
+    PropertyEmbedding,
+    PropertyFactSheet,
+)
 
 
 @admin.register(PropertyEmbedding)
 class PropertyEmbeddingAdmin(admin.ModelAdmin):
-    list_display = ("id", "property", "short_chunk", "created_at")
+    list_display = (
+        "id",
+        "property",
+        "document",
+        "page_start",
+        "page_end",
+        "model_name",
+        "dimensions",
+        "short_chunk",
+        "created_at",
+    )
+    list_filter = ("model_name", "dimensions")
     search_fields = ("property__title", "chunk")
 
     def short_chunk(self, obj):
@@ -14,6 +32,13 @@ class PropertyEmbeddingAdmin(admin.ModelAdmin):
     short_chunk.short_description = "Chunk (Preview)"
 
 
+@admin.register(PropertyFactSheet)
+class PropertyFactSheetAdmin(admin.ModelAdmin):
+    list_display = ("id", "property", "token_count", "model_name", "last_updated")
+    search_fields = ("property__title", "content")
+    readonly_fields = ("source_hash", "token_count", "model_name")
+
+
 @admin.register(PropertyChatHistory)
 class PropertyChatHistoryAdmin(admin.ModelAdmin):
     list_display = (
@@ -41,3 +66,66 @@ class PropertyChatHistoryAdmin(admin.ModelAdmin):
         return obj.answer[:50] + "..." if len(obj.answer) > 50 else obj.answer
 
     short_answer.short_description = "Answer (Preview)"
+
+
+@admin.register(DocumentText)
+class DocumentTextAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "document",
+        "extraction_plan",
+        "extractor_version",
+        "page_count",
+        "compressed_size",
+        "last_updated",
+    )
+    list_filter = ("extraction_plan", "extractor_version")
+    search_fields = ("document__property__title", "content_hash")
+    exclude = ("compressed_pages",)
+    readonly_fields = ("content_hash", "extractor_version", "page_count")
+
+    def compressed_size(self, obj):
+        return f"{len(obj.compressed_pages) / 1024:.1f} KB"
+
+    compressed_size.short_description = "Compressed Size"
+
+
+@admin.register(DocumentIngestionJob)
+class DocumentIngestionJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "document",
+        "status",
+        "current_stage",
+        "slowest_stage",
+        "extraction_plan",
+        "estimated_seconds",
+        "page_count",
+        "chunk_count",
+        "duration",
+        "created_at",
+    )
+    list_filter = ("status", "current_stage", "extraction_plan")
+    search_fields = ("document__property__title", "error")
+    readonly_fields = ("stages", "started_at", "finished_at", "idempotency_key")
+
+    def slowest_stage(self, obj):
+        timed = {
+            stage: info["seconds"]
+            for stage, info in obj.stages.items()
+            if info.get("seconds") is not None
+        }
+        if not timed:
+            return "-"
+        stage = max(timed, key=timed.get)
+        return f"{stage} ({timed[stage]}s)"
+
+    slowest_stage.short_description = "Slowest Stage"
+
+
+@admin.register(EmbeddingGeneration)
+class EmbeddingGenerationAdmin(admin.ModelAdmin):
+    list_display = ("id", "model_name", "dimensions", "status", "activated_at")
+    list_filter = ("status",)
+    # Status changes go through `manage.py embedding_generations` so cutover stays atomic
+    readonly_fields = ("status", "activated_at")
@@ -0,0 +1,37 @@
+import logging
+
+import openai
+from django.conf import settings
+
+from .embedding_service import retry_after
+from .rate_limiter import chat_rate_limiter
+from .text_processing import count_tokens
+
+logger = logging.getLogger(__name__)
+
+
+def generate_chat_completion(messages, model=None, temperature=0.2, max_tokens=None):
+    """
+    Run a chat completion through the shared rate limiter.
+    Returns the reply text, or None on failure.
+    """
+    model = model or settings.CHAT_MODEL
+    max_tokens = max_tokens or settings.CHAT_MAX_TOKENS
+    try:
+        # The provider counts max_tokens against the quota up front
+        chat_rate_limiter.acquire(
+            tokens=sum(count_tokens(m["content"], model) for m in messages) + max_tokens
+        )
+        response = openai.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        return response.choices[0].message.content.strip()
+    except openai.RateLimitError as e:
+        chat_rate_limiter.pause(retry_after(e, attempt=0))
+        logger.warning(f"ChatCompletion rate limited: {e}")
+    except Exception as e:
+        logger.error(f"ChatCompletion error: {e}")
+    return None
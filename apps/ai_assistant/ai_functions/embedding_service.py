@@ -1,33 +1,84 @@
+import functools
 import logging
 import os
 
 import openai
 from django.conf import settings
 
+from .rate_limiter import embedding_rate_limiter
+from .text_processing import count_tokens
+
 logger = logging.getLogger(__name__)
 
 openai.api_key = os.getenv("OPENAI_API_KEY", settings.OPENAI_API_KEY)
 
+# Models with a fixed output size that reject the `dimensions` parameter
+FIXED_DIMENSION_MODELS = {"text-embedding-ada-002"}
+
 
-def generate_embeddling(text, model="text-embedding-ada-002"):
+@functools.cache
+def embeddings_client():
     """
-    Generate embedding for a given text chunk using OpenAI Embedding API.
+    OpenAI client for embeddings without the SDK's own retries: rate limits
+    are handled by the shared limiter so the whole cluster backs off together.
+    Other OpenAI calls keep the module client and its retries.
     """
+    return openai.OpenAI(api_key=openai.api_key, max_retries=0)
+
+
+def retry_after(error, attempt):
+    response = getattr(error, "response", None)
+    header = response.headers.get("retry-after") if response is not None else None
     try:
-        if not text.strip():
-            logger.warning("Skipping empty text for embedding.")
-            return None
+        return float(header)
+    except (TypeError, ValueError):
+        return min(2**attempt, 60)
 
-        response = openai.embeddings.create(input=text, model=model)
 
-        embedding = response["data"][0]["embedding"]
-        if not embedding:
-            logger.error("OpenAI returned an empty embedding.")
+def generate_embeddings(texts, model=None, dimensions=None):
+    """
+    Generate embeddings for a batch of text chunks in a single API request.
+    Returns one embedding per input, in input order, or None on failure.
+    """
+    model = model or settings.EMBEDDING_MODEL
+    options = {}
+    if dimensions and model not in FIXED_DIMENSION_MODELS:
+        options["dimensions"] = dimensions
+    tokens = sum(count_tokens(text, model) for text in texts)
+    for attempt in range(settings.EMBEDDING_MAX_RETRIES + 1):
+        embedding_rate_limiter.acquire(tokens=tokens)
+        try:
+            response = embeddings_client().embeddings.create(
+                input=texts, model=model, **options
+            )
+            return [
+                item.embedding
+                for item in sorted(response.data, key=lambda item: item.index)
+            ]
+        except openai.RateLimitError as e:
+            delay = retry_after(e, attempt)
+            logger.warning(f"OpenAI rate limit hit, backing off for {delay}s")
+            embedding_rate_limiter.pause(delay)
+        except openai.OpenAIError as e:
+            logger.error(f"OpenAI API error: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error calling OpenAI: {e}", exc_info=True)
+            return None
+    logger.error("OpenAI rate limit retries exhausted.")
+    return None
 
-        return embedding
-    except openai.OpenAIError as e:
-        logger.error(f"OpenAI API error: {e}")
+
+def generate_embeddling(text, model=None, dimensions=None):
+    """
+    Generate embedding for a given text chunk using OpenAI Embedding API.
+    """
+    if not text.strip():
+        logger.warning("Skipping empty text for embedding.")
         return None
-    except Exception as e:
-        logger.error(f"Unexpected error calling OpenAI: {e}", exc_info=True)
+
+    embeddings = generate_embeddings([text], model=model, dimensions=dimensions)
+    if not embeddings or not embeddings[0]:
+        logger.error("OpenAI returned an empty embedding.")
         return None
+    return embeddings[0]
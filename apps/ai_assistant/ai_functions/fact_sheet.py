@@ -0,0 +1,115 @@
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+
+from apps.properties.models import Property
+
+from ..models import DocumentText, PropertyFactSheet
+from .chat_service import generate_chat_completion
+from .text_processing import clean_text, count_tokens
+
+logger = logging.getLogger(__name__)
+
+FACT_SHEET_CACHE_TIMEOUT = 60 * 60  # 1 hour
+
+FACT_SHEET_PROMPT = (
+    "Write a compact fact sheet for this property using only the documents "
+    "below. Use short 'Label: value' lines covering key terms, title status, "
+    "plot size, fees and any other fact a buyer or tenant is likely to ask "
+    "about. Leave out anything the documents do not state."
+)
+
+
+def _cache_key(property_id):
+    return f"property_fact_sheet_{property_id}"
+
+
+def get_fact_sheet(property_id):
+    """
+    The property's fact sheet as a {"content", "token_count"} dict, or None.
+    Cached, including its absence, until the sheet is refreshed or invalidated.
+    """
+    cached = cache.get(_cache_key(property_id))
+    if cached is None:
+        sheet = (
+            PropertyFactSheet.objects.filter(property_id=property_id)
+            .values("content", "token_count")
+            .first()
+        )
+        cached = sheet or {}
+        cache.set(_cache_key(property_id), cached, FACT_SHEET_CACHE_TIMEOUT)
+    return cached or None
+
+
+def invalidate_fact_sheet(property_id):
+    """
+    Drop a sheet whose documents changed, so chat falls back to retrieval until
+    it is refreshed.
+    """
+    PropertyFactSheet.objects.filter(property_id=property_id).delete()
+    cache.delete(_cache_key(property_id))
+
+
+def refresh_fact_sheet(property_id):
+    """
+    Regenerate a property's fact sheet from the stored text of its documents.
+    Properties with too much document text, or documents still being ingested,
+    get no sheet. Returns the sheet, if any.
+    """
+    property_instance = Property.objects.get(pk=property_id)
+    texts = list(
+        DocumentText.objects.filter(
+            document__property=property_instance,
+            content_hash=F("document__content_hash"),
+        )
+        .select_related("document")
+        .order_by("document_id")
+    )
+    if not texts or len(texts) < property_instance.documents.count():
+        invalidate_fact_sheet(property_id)
+        return None
+
+    source_hash = hashlib.sha256(
+        "".join(text.content_hash for text in texts).encode()
+    ).hexdigest()
+    sheet = PropertyFactSheet.objects.filter(property_id=property_id).first()
+    if sheet and sheet.source_hash == source_hash:
+        return sheet
+
+    sources = [
+        f"[{text.document.get_document_type_display()}]\n"
+        + " ".join(clean_text(page) for page in text.pages)
+        for text in texts
+    ]
+    source_tokens = sum(count_tokens(source, settings.CHAT_MODEL) for source in sources)
+    if source_tokens > settings.FACT_SHEET_SOURCE_TOKENS:
+        # Large document sets are better served by per-question retrieval
+        invalidate_fact_sheet(property_id)
+        return None
+
+    content = generate_chat_completion(
+        [
+            {"role": "system", "content": FACT_SHEET_PROMPT},
+            {"role": "user", "content": "\n\n".join(sources)},
+        ],
+        temperature=0,
+        max_tokens=settings.FACT_SHEET_MAX_TOKENS,
+    )
+    if not content:
+        logger.warning(f"Fact sheet generation failed for property {property_id}")
+        return sheet
+
+    sheet, _ = PropertyFactSheet.objects.update_or_create(
+        property=property_instance,
+        defaults={
+            "content": content,
+            "token_count": count_tokens(content, settings.CHAT_MODEL),
+            "source_hash": source_hash,
+            "model_name": settings.CHAT_MODEL,
+        },
+    )
+    cache.delete(_cache_key(property_id))
+    return sheet
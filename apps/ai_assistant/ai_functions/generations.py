@@ -0,0 +1,171 @@
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import EmbeddingGeneration, PropertyEmbedding
+from .embedding_service import generate_embeddings
+
+logger = logging.getLogger(__name__)
+
+GENERATIONS_CACHE_KEY = "embedding_generations"
+# Short enough that every process picks up a cutover within a minute
+GENERATIONS_CACHE_TIMEOUT = 60
+
+
+def _load_generations():
+    generations = cache.get(GENERATIONS_CACHE_KEY)
+    if generations is None:
+        generations = list(EmbeddingGeneration.objects.exclude(status="retired"))
+        cache.set(GENERATIONS_CACHE_KEY, generations, GENERATIONS_CACHE_TIMEOUT)
+    return generations
+
+
+def get_active_generation():
+    """
+    The generation every read uses. Falls back to the configured model until a
+    generation has been registered.
+    """
+    for generation in _load_generations():
+        if generation.status == "active":
+            return generation
+    return EmbeddingGeneration(
+        model_name=settings.EMBEDDING_MODEL,
+        dimensions=settings.EMBEDDING_DIMENSIONS,
+        status="active",
+    )
+
+
+def get_write_generations():
+    """
+    The active generation first, followed by any generation being backfilled.
+    """
+    backfilling = [g for g in _load_generations() if g.status == "backfilling"]
+    return [get_active_generation(), *backfilling]
+
+
+def start_generation(model_name, dimensions):
+    """
+    Register a new generation for dual-writing. Reads stay on the active one.
+    """
+    with transaction.atomic():
+        if not EmbeddingGeneration.objects.filter(status="active").exists():
+            # Make the generation currently being served explicit before adding one
+            EmbeddingGeneration.objects.get_or_create(
+                model_name=settings.EMBEDDING_MODEL,
+                dimensions=settings.EMBEDDING_DIMENSIONS,
+                defaults={"status": "active", "activated_at": timezone.now()},
+            )
+        if EmbeddingGeneration.objects.filter(status="backfilling").exists():
+            raise ValueError("Another embedding generation is already backfilling.")
+        generation, created = EmbeddingGeneration.objects.get_or_create(
+            model_name=model_name, dimensions=dimensions
+        )
+        if not created:
+            if generation.status == "active":
+                raise ValueError(f"{generation} is already active.")
+            generation.status = "backfilling"
+            generation.save(update_fields=["status", "last_updated"])
+        transaction.on_commit(lambda: cache.delete(GENERATIONS_CACHE_KEY))
+    return generation
+
+
+def missing_chunk_groups(generation):
+    """
+    (property_id, document_id) groups that have active chunks but none yet in
+    the given generation.
+    """
+    active = get_active_generation()
+    done = set(
+        generation.embeddings.values_list("property_id", "document_id").distinct()
+    )
+    groups = active.embeddings.values_list("property_id", "document_id").distinct()
+    return [group for group in groups.order_by("property_id") if group not in done]
+
+
+def backfill_generation(generation):
+    """
+    Embed the active generation's chunks with the new model, one document at a
+    time. Chunk text is reused, so no document is extracted again.
+    Returns the number of chunks written.
+    """
+    active = get_active_generation()
+    written = 0
+    for property_id, document_id in missing_chunk_groups(generation):
+        sources = list(
+            active.embeddings.filter(
+                property_id=property_id, document_id=document_id
+            ).order_by("id")
+        )
+        rows = []
+        for start in range(0, len(sources), settings.EMBEDDING_BATCH_SIZE):
+            batch = sources[start : start + settings.EMBEDDING_BATCH_SIZE]
+            embeddings = generate_embeddings(
+                [source.chunk for source in batch],
+                model=generation.model_name,
+                dimensions=generation.dimensions,
+            )
+            if not embeddings:
+                rows = None
+                break
+            rows.extend(
+                PropertyEmbedding(
+                    property_id=property_id,
+                    document_id=document_id,
+                    page_start=source.page_start,
+                    page_end=source.page_end,
+                    chunk=source.chunk,
+                    embedding=embedding,
+                    model_name=generation.model_name,
+                    dimensions=generation.dimensions,
+                )
+                for source, embedding in zip(batch, embeddings)
+            )
+        if not rows:
+            logger.warning(
+                f"Backfill of {generation} skipped document {document_id} "
+                f"of property {property_id}"
+            )
+            continue
+        with transaction.atomic():
+            # A concurrent re-ingestion may already have dual-written this document
+            if not generation.embeddings.filter(
+                property_id=property_id, document_id=document_id
+            ).exists():
+                PropertyEmbedding.objects.bulk_create(rows)
+                written += len(rows)
+    return written
+
+
+def cutover(generation):
+    """
+    Atomically make a backfilled generation the one every read uses and retire
+    the previous active generation.
+    """
+    with transaction.atomic():
+        EmbeddingGeneration.objects.filter(status="active").update(
+            status="retired", last_updated=timezone.now()
+        )
+        generation.status = "active"
+        generation.activated_at = timezone.now()
+        generation.save(update_fields=["status", "activated_at", "last_updated"])
+        transaction.on_commit(lambda: cache.delete(GENERATIONS_CACHE_KEY))
+    return generation
+
+
+def cleanup_retired_generations(batch_size=5000):
+    """
+    Delete chunks of retired generations in bounded batches so no single
+    DELETE holds locks for long. Returns the number of rows removed.
+    """
+    deleted = 0
+    for generation in EmbeddingGeneration.objects.filter(status="retired"):
+        while True:
+            ids = list(generation.embeddings.values_list("id", flat=True)[:batch_size])
+            if not ids:
+                break
+            deleted += PropertyEmbedding.objects.filter(id__in=ids).delete()[0]
+        generation.delete()
+    return deleted
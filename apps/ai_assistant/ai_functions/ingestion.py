@@ -0,0 +1,297 @@
+import hashlib
+import logging
+import os
+import uuid
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Exists, Max, OuterRef
+
+from apps.properties.models import Document
+
+from ..models import DocumentIngestionJob, DocumentText, PropertyEmbedding
+from .generations import get_write_generations
+from .pdf_extractor import (
+    EXTRACTOR_VERSION,
+    estimate_extraction_seconds,
+    extract_pages_from_pdf,
+    extract_pages_from_scanned_pdf,
+    preflight_pdf,
+)
+from .retrieval import bump_retrieval_version
+from .save_function import (
+    copy_document_embeddings,
+    embed_document_chunks,
+    replace_document_embeddings,
+)
+from .text_processing import clean_text, split_pages_into_chunks
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionError(Exception):
+    pass
+
+
+def ingestion_key(document):
+    """
+    Idempotency key of one version of a document's file, so signalling the
+    same upload twice queues a single job.
+    """
+    return hashlib.sha256(f"{document.pk}:{document.file.name}".encode()).hexdigest()
+
+
+@contextmanager
+def document_lock(document_id):
+    """
+    Cluster-wide lock on ingesting one document, held in the shared cache.
+    Yields False at once when another worker holds it. It expires after
+    INGESTION_LOCK_TIMEOUT so a worker that died cannot block the document.
+    """
+    key = f"ingestion_lock:{document_id}"
+    owner = uuid.uuid4().hex
+    acquired = cache.add(key, owner, settings.INGESTION_LOCK_TIMEOUT)
+    try:
+        yield acquired
+    finally:
+        if acquired and cache.get(key) == owner:
+            cache.delete(key)
+
+
+def fingerprint_file(file_path, block_size=1024 * 1024):
+    """
+    SHA-256 of a file, read in blocks so large scans are never loaded whole.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def find_processed_duplicate(document, generations):
+    """
+    Another document with identical content that already has chunks in every
+    one of the given generations, if any, so reusing it leaves none without.
+    """
+    if not document.content_hash:
+        return None
+    duplicates = Document.objects.filter(content_hash=document.content_hash).exclude(
+        pk=document.pk
+    )
+    for generation in generations:
+        duplicates = duplicates.filter(
+            Exists(
+                PropertyEmbedding.objects.filter(
+                    document=OuterRef("pk"),
+                    model_name=generation.model_name,
+                    dimensions=generation.dimensions,
+                )
+            )
+        )
+    return duplicates.order_by("id").first()
+
+
+def get_stored_text(document):
+    """
+    The document's stored page text, unless it was extracted from a different
+    file or by an older extractor.
+    """
+    return DocumentText.objects.filter(
+        document=document,
+        content_hash=document.content_hash,
+        extractor_version=EXTRACTOR_VERSION,
+    ).first()
+
+
+def store_text(document, pages, extraction_plan):
+    """
+    Keep the raw extracted pages of a document, replacing any earlier text.
+    """
+    text = DocumentText(
+        content_hash=document.content_hash,
+        extractor_version=EXTRACTOR_VERSION,
+        extraction_plan=extraction_plan,
+    )
+    text.pages = pages
+    DocumentText.objects.update_or_create(
+        document=document,
+        defaults={
+            field: getattr(text, field)
+            for field in [
+                "content_hash",
+                "extractor_version",
+                "extraction_plan",
+                "page_count",
+                "compressed_pages",
+            ]
+        },
+    )
+
+
+def _file_path(document):
+    file_path = document.file.path
+    if not os.path.exists(file_path):
+        raise IngestionError(f"File not found: {file_path}")
+    return file_path
+
+
+def extract_document(job, file_path, on_heavy=None):
+    """
+    Preflight the file and extract its raw page text with the chosen plan.
+    Returns None when the job was handed to `on_heavy` instead.
+    """
+    if not job.extraction_plan:
+        with job.track_stage("preflight"):
+            preflight = preflight_pdf(file_path)
+            job.extraction_plan = preflight.plan
+            job.estimated_seconds = estimate_extraction_seconds(preflight)
+            job.page_count = preflight.page_count
+            job.save(update_fields=["extraction_plan", "estimated_seconds"])
+
+    if on_heavy and job.estimated_seconds >= settings.INGESTION_HEAVY_SECONDS:
+        job.mark_pending()
+        on_heavy(job)
+        logger.info(f"Document {job.document_id} handed to the OCR queue")
+        return None
+
+    if job.extraction_plan == "ocr":
+        pages = []
+    else:
+        with job.track_stage("extract"):
+            pages = extract_pages_from_pdf(file_path)
+            job.page_count = len(pages)
+
+    if not any(page.strip() for page in pages):
+        # Scanned, or the text layer turned out to be empty after all
+        with job.track_stage("ocr"):
+            pages = extract_pages_from_scanned_pdf(file_path)
+            job.page_count = len(pages)
+    elif job.extraction_plan == "mixed":
+        with job.track_stage("ocr"):
+            missing = [n for n, page in enumerate(pages, 1) if not page.strip()]
+            ocr_pages = extract_pages_from_scanned_pdf(file_path, missing)
+            for number, text in zip(missing, ocr_pages):
+                pages[number - 1] = text
+    return pages
+
+
+def run_ingestion(job, on_heavy=None, reuse_duplicates=True):
+    """
+    Runs a document through preflight, extraction, OCR, cleaning, chunking,
+    embedding and persisting, recording every stage on the ingestion job.
+    Stored text of the same file is cleaned and chunked again instead of
+    extracting; the file is not opened at all once it has been fingerprinted.
+    When preflight estimates more than INGESTION_HEAVY_SECONDS of extraction,
+    `on_heavy`, if given, is called with the job instead of extracting here.
+    """
+    document = job.document
+    job.mark_running()
+    try:
+        # Cleared whenever the file is replaced
+        if not document.content_hash:
+            with job.track_stage("fingerprint"):
+                document.content_hash = fingerprint_file(_file_path(document))
+                # update() rather than save() so the Document signals do not fire again
+                Document.objects.filter(pk=document.pk).update(
+                    content_hash=document.content_hash
+                )
+        write_generations = get_write_generations()
+        source = reuse_duplicates and find_processed_duplicate(
+            document, write_generations
+        )
+
+        if source:
+            with job.track_stage("reuse"):
+                job.reused_from = source
+                job.chunk_count = copy_document_embeddings(
+                    source, document, write_generations
+                )
+                source_text = get_stored_text(source)
+                if source_text:
+                    store_text(document, source_text.pages, source_text.extraction_plan)
+                job.page_count = (
+                    source.embeddings.aggregate(pages=Max("page_end"))["pages"] or 0
+                )
+            job.mark_succeeded()
+            logger.info(f"Document {document.id} reused chunks of {source.id}")
+            return job
+
+        stored_text = get_stored_text(document)
+        if stored_text:
+            with job.track_stage("stored_text"):
+                pages = stored_text.pages
+                job.extraction_plan = stored_text.extraction_plan
+                job.page_count = len(pages)
+        else:
+            pages = extract_document(job, _file_path(document), on_heavy)
+            if pages is None:
+                return job
+            store_text(document, pages, job.extraction_plan)
+
+        with job.track_stage("clean"):
+            pages = [clean_text(page) for page in pages]
+            if not any(pages):
+                raise IngestionError("No valid text extracted from the document.")
+
+        with job.track_stage("chunk"):
+            chunks = split_pages_into_chunks(pages)
+            job.chunk_count = len(chunks)
+
+        with job.track_stage("embed"):
+            active, *backfilling = write_generations
+            rows = embed_document_chunks(document, chunks, active)
+            expected = len([chunk for chunk in chunks if chunk.text])
+            if not rows or len(rows) != expected:
+                # Fail rather than swap a partial set in for the complete old one
+                raise IngestionError(
+                    f"{len(rows)} of {expected} chunks could be embedded."
+                )
+            saved = len(rows)
+            # Dual-write generations being backfilled; a miss is left to the backfill
+            for generation in backfilling:
+                extra = embed_document_chunks(document, chunks, generation)
+                if len(extra) == saved:
+                    rows.extend(extra)
+                else:
+                    logger.warning(
+                        f"Dual-write to {generation} failed for {document.id}"
+                    )
+            job.chunk_count = saved
+
+        with job.track_stage("persist"):
+            # The previous chunks of this document stay live until this swap
+            replace_document_embeddings(document, rows)
+
+        job.mark_succeeded()
+        logger.info(f"Document {document.id} ingested into {saved} chunks")
+    except Exception as e:
+        logger.error(f"Error ingesting document {document.id}: {e}", exc_info=True)
+        job.mark_failed(e)
+    return job
+
+
+def reingest_document(document):
+    """
+    Re-runs a document through ingestion, starting from its stored text where
+    there is one. The document swaps its own chunks.
+    """
+    return run_ingestion(
+        DocumentIngestionJob.objects.create(document=document),
+        # Re-chunk this document rather than copy a duplicate's old chunks
+        reuse_duplicates=False,
+    )
+
+
+def drop_unlinked_chunks(property_id):
+    """
+    Drops a property's chunks embedded before they were linked to a document,
+    once every document of the property has been re-embedded.
+    """
+    with transaction.atomic():
+        PropertyEmbedding.objects.filter(
+            property_id=property_id, document__isnull=True
+        ).delete()
+        transaction.on_commit(lambda: bump_retrieval_version(property_id))
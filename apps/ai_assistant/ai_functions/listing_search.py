@@ -0,0 +1,223 @@
+import hashlib
+import threading
+import time
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.properties.models import Property
+
+from ..models import PropertyListingEmbedding
+from .embedding_service import generate_embeddings
+
+LISTING_INDEX_VERSION_KEY = "listing_index_version"
+QUERY_EMBEDDING_CACHE_TIMEOUT = 60 * 60 * 24
+# Rows are re-read with this overlap so a save committed late is never missed
+REFRESH_OVERLAP = timedelta(minutes=1)
+
+
+def bump_listing_index_version():
+    cache.set(LISTING_INDEX_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def listing_text(property_instance):
+    """
+    The text a listing is searched by.
+    """
+    parts = [property_instance.title]
+    if property_instance.bedrooms:
+        parts.append(f"{property_instance.bedrooms} bedroom")
+    parts.append(property_instance.get_property_type_display())
+    if property_instance.description:
+        parts.append(property_instance.description)
+    return " ".join(parts)
+
+
+def _to_unit_vector(embedding):
+    vector = np.asarray(embedding, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def embed_listings(properties):
+    """
+    Embed the listing text of properties whose text changed since it was last
+    embedded, in batched requests. Returns the number of listings embedded.
+    """
+    model = settings.LISTING_EMBEDDING_MODEL
+    dimensions = settings.LISTING_EMBEDDING_DIMENSIONS
+    texts = {p.id: listing_text(p) for p in properties}
+    hashes = {
+        pk: hashlib.sha256(text.encode()).hexdigest() for pk, text in texts.items()
+    }
+    current = set(
+        PropertyListingEmbedding.objects.filter(
+            property_id__in=texts, model_name=model, dimensions=dimensions
+        ).values_list("property_id", "text_hash")
+    )
+    pending = [pk for pk in texts if (pk, hashes[pk]) not in current]
+
+    embedded = 0
+    for start in range(0, len(pending), settings.EMBEDDING_BATCH_SIZE):
+        batch = pending[start : start + settings.EMBEDDING_BATCH_SIZE]
+        embeddings = generate_embeddings(
+            [texts[pk] for pk in batch], model=model, dimensions=dimensions
+        )
+        if not embeddings:
+            continue
+        PropertyListingEmbedding.objects.bulk_create(
+            [
+                PropertyListingEmbedding(
+                    property_id=pk,
+                    text_hash=hashes[pk],
+                    embedding=_to_unit_vector(embedding).tobytes(),
+                    model_name=model,
+                    dimensions=dimensions,
+                )
+                for pk, embedding in zip(batch, embeddings)
+            ],
+            update_conflicts=True,
+            unique_fields=["property"],
+            update_fields=[
+                "text_hash",
+                "embedding",
+                "model_name",
+                "dimensions",
+                "last_updated",
+            ],
+        )
+        embedded += len(batch)
+    if embedded:
+        bump_listing_index_version()
+    return embedded
+
+
+class ListingIndex:
+    """
+    Process-local matrix of unit-length embeddings of live listings. It is
+    loaded once and then refreshed with only the rows saved, and the listings
+    deleted, since, whenever the shared index version moves.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.version = None
+        self.loaded_at = None
+        # (ids, matrix) replaced as one tuple so searches never mix two refreshes
+        self.snapshot = (
+            np.empty(0, dtype=np.int64),
+            np.empty((0, settings.LISTING_EMBEDDING_DIMENSIONS), np.float32),
+        )
+        self.positions = {}
+
+    def refresh(self):
+        version = cache.get_or_set(
+            LISTING_INDEX_VERSION_KEY, time.time_ns, timeout=None
+        )
+        if version == self.version:
+            return
+        with self._lock:
+            if version == self.version:
+                return
+            started = timezone.now()
+            ids, matrix = self.snapshot
+            rows = PropertyListingEmbedding.objects.filter(
+                model_name=settings.LISTING_EMBEDDING_MODEL,
+                dimensions=settings.LISTING_EMBEDDING_DIMENSIONS,
+                property__deleted_at__isnull=True,
+            )
+            if self.loaded_at:
+                since = self.loaded_at - REFRESH_OVERLAP
+                rows = rows.filter(last_updated__gte=since)
+                deleted = Property.all_objects.filter(
+                    deleted_at__gte=since
+                ).values_list("id", flat=True)
+                keep = ~np.isin(ids, np.fromiter(deleted, dtype=np.int64))
+                if not keep.all():
+                    # Deleted listings would take result slots the view drops
+                    ids, matrix = ids[keep], matrix[keep]
+                    self.positions = {pk: i for i, pk in enumerate(ids.tolist())}
+            rows = list(rows.values_list("property_id", "embedding"))
+
+            new_ids, new_vectors, replaced = [], [], {}
+            for property_id, embedding in rows:
+                vector = np.frombuffer(embedding, dtype=np.float32)
+                position = self.positions.get(property_id)
+                if position is None:
+                    self.positions[property_id] = len(ids) + len(new_ids)
+                    new_ids.append(property_id)
+                    new_vectors.append(vector)
+                else:
+                    replaced[position] = vector
+            if replaced:
+                # Copy before writing; searches may still be reading the old matrix
+                matrix = matrix.copy()
+                for position, vector in replaced.items():
+                    matrix[position] = vector
+            if new_ids:
+                matrix = np.vstack([matrix, np.stack(new_vectors)])
+                ids = np.concatenate([ids, np.array(new_ids, dtype=np.int64)])
+            self.snapshot = (ids, matrix)
+            self.loaded_at = started
+            self.version = version
+
+    def search(self, query_vector, allowed_ids=None, limit=20):
+        """
+        Rank listings by cosine similarity to the query. `allowed_ids` is
+        turned into a bitmap over the index first, so only listings that meet
+        the structured filters are scored at all.
+        Returns [(property_id, score)], best first.
+        """
+        ids, matrix = self.snapshot
+        if allowed_ids is not None:
+            allowed = np.fromiter(allowed_ids, dtype=np.int64)
+            candidates = np.flatnonzero(np.isin(ids, allowed))
+            ids, matrix = ids[candidates], matrix[candidates]
+        if not len(ids):
+            return []
+        scores = matrix @ query_vector
+        limit = min(limit, len(scores))
+        best = np.argpartition(-scores, limit - 1)[:limit]
+        best = best[np.argsort(-scores[best])]
+        return [(int(ids[i]), float(scores[i])) for i in best]
+
+
+listing_index = ListingIndex()
+
+
+def embed_query(query):
+    """
+    Unit-length embedding of a search query, cached so repeated searches skip
+    the embeddings API.
+    """
+    model = settings.LISTING_EMBEDDING_MODEL
+    dimensions = settings.LISTING_EMBEDDING_DIMENSIONS
+    normalized = " ".join(query.lower().split())
+    key = (
+        f"listing_query_{model}_{dimensions}_"
+        f"{hashlib.sha256(normalized.encode()).hexdigest()}"
+    )
+    vector = cache.get(key)
+    if vector is None:
+        embeddings = generate_embeddings(
+            [normalized], model=model, dimensions=dimensions
+        )
+        if not embeddings:
+            return None
+        vector = _to_unit_vector(embeddings[0])
+        cache.set(key, vector, QUERY_EMBEDDING_CACHE_TIMEOUT)
+    return vector
+
+
+def search_listings(query, allowed_ids=None, limit=20):
+    """
+    Semantic listing search. Returns [(property_id, score)] best first, or None
+    when the query could not be embedded.
+    """
+    query_vector = embed_query(query)
+    if query_vector is None:
+        return None
+    listing_index.refresh()
+    return listing_index.search(query_vector, allowed_ids, limit)
@@ -0,0 +1,102 @@
+import logging
+import time
+import uuid
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Seconds of quota a bucket may hold, so an idle cluster cannot burst a whole
+# minute's worth of requests at once and overshoot the provider's window
+BURST_SECONDS = 6
+# A lock holder that died releases the bucket after this long
+LOCK_TIMEOUT = 2
+# An idle bucket is full again long before its state expires
+STATE_TIMEOUT = 300
+
+
+class TokenBucketLimiter:
+    """
+    Requests- and tokens-per-minute limiter kept in the shared cache, so every
+    web process and Celery worker draws from one quota. Callers reserve
+    capacity in arrival order and may take the bucket into debt; each then
+    sleeps only until the debt ahead of it has refilled, which queues waiting
+    callers fairly instead of letting them race on retries.
+    """
+
+    def __init__(self, name, requests_per_minute, tokens_per_minute):
+        self.key = f"openai_rate_limit:{name}"
+        self.lock_key = f"{self.key}:lock"
+        headroom = settings.OPENAI_RATE_LIMIT_HEADROOM
+        self.rates = {
+            "requests": requests_per_minute * headroom / 60,
+            "tokens": tokens_per_minute * headroom / 60,
+        }
+        # Number of calls this process had to wait for, for progress reports
+        self.throttled = 0
+
+    @contextmanager
+    def _locked(self):
+        owner = uuid.uuid4().hex
+        while not cache.add(self.lock_key, owner, LOCK_TIMEOUT):
+            time.sleep(0.005)
+        try:
+            yield
+        finally:
+            if cache.get(self.lock_key) == owner:
+                cache.delete(self.lock_key)
+
+    def _levels(self, now):
+        state = cache.get(self.key)
+        levels = {name: rate * BURST_SECONDS for name, rate in self.rates.items()}
+        if state:
+            elapsed = max(now - state["at"], 0)
+            for name, rate in self.rates.items():
+                levels[name] = min(levels[name], state["levels"][name] + rate * elapsed)
+        return levels
+
+    def _reserve(self, costs):
+        with self._locked():
+            now = time.time()
+            levels = self._levels(now)
+            for name, cost in costs.items():
+                levels[name] -= cost
+            cache.set(self.key, {"at": now, "levels": levels}, STATE_TIMEOUT)
+        return max(-levels[name] / self.rates[name] for name in levels)
+
+    def acquire(self, tokens=0, requests=1):
+        """
+        Block until this call fits under the cluster-wide quota.
+        Returns the number of seconds waited.
+        """
+        wait = self._reserve({"requests": requests, "tokens": tokens})
+        if wait > 0:
+            self.throttled += 1
+            logger.debug(f"{self.key} waiting {wait:.2f}s for capacity")
+            time.sleep(wait)
+            return wait
+        return 0
+
+    def pause(self, seconds):
+        """
+        Empty the bucket so no caller anywhere starts a request for `seconds`,
+        used when the provider answers 429 despite the limiter.
+        """
+        with self._locked():
+            now = time.time()
+            levels = self._levels(now)
+            for name, rate in self.rates.items():
+                levels[name] = min(levels[name], -rate * seconds)
+            cache.set(self.key, {"at": now, "levels": levels}, STATE_TIMEOUT)
+
+
+embedding_rate_limiter = TokenBucketLimiter(
+    "embeddings",
+    settings.EMBEDDING_REQUESTS_PER_MINUTE,
+    settings.EMBEDDING_TOKENS_PER_MINUTE,
+)
+chat_rate_limiter = TokenBucketLimiter(
+    "chat", settings.CHAT_REQUESTS_PER_MINUTE, settings.CHAT_TOKENS_PER_MINUTE
+)
@@ -0,0 +1,64 @@
+import time
+
+import numpy as np
+from django.core.cache import cache
+
+from .generations import get_active_generation
+
+RETRIEVAL_CACHE_TIMEOUT = 60 * 60  # 1 hour
+
+
+def _version_key(property_id):
+    return f"property_retrieval_version_{property_id}"
+
+
+def get_retrieval_version(property_id):
+    """
+    Current version of a property's chunks. A fresh timestamp is used when the
+    key is missing, so an evicted version can never revive stale entries.
+    """
+    return cache.get_or_set(_version_key(property_id), time.time_ns, timeout=None)
+
+
+def bump_retrieval_version(property_id):
+    """
+    Invalidate every cached retrieval entry of a property without scanning keys.
+    """
+    cache.set(_version_key(property_id), time.time_ns(), timeout=None)
+
+
+def get_property_chunks(property_id):
+    """
+    Returns the property's chunks in the active embedding generation and a matrix
+    of their unit-length embeddings, cached until the property's retrieval
+    version or the active generation changes.
+    """
+    generation = get_active_generation()
+    key = (
+        f"property_chunks_{property_id}_{generation.model_name}_"
+        f"{generation.dimensions}_{get_retrieval_version(property_id)}"
+    )
+    cached = cache.get(key)
+    if cached is None:
+        rows = list(
+            generation.embeddings.filter(
+                property_id=property_id, embedding__isnull=False
+            ).values_list("chunk", "embedding")
+        )
+        chunks = [chunk for chunk, _ in rows]
+        matrix = np.array([embedding for _, embedding in rows], dtype=np.float32)
+        if len(matrix):
+            matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+        cached = (chunks, matrix)
+        cache.set(key, cached, RETRIEVAL_CACHE_TIMEOUT)
+    return cached
+
+
+def top_chunks(chunks, matrix, question_embedding, limit=3):
+    """
+    Rank chunks by cosine similarity to the question in one matrix product.
+    """
+    question = np.asarray(question_embedding, dtype=np.float32)
+    scores = matrix @ (question / np.linalg.norm(question))
+    best = np.argsort(scores)[::-1][:limit]
+    return [chunks[i] for i in best]
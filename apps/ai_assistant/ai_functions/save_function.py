@@ -1,28 +1,134 @@
 import logging
 
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
 from apps.ai_assistant.models import PropertyEmbedding
+from apps.properties.models import Document
 
-from .embedding_service import generate_embeddling
+from .embedding_service import generate_embeddings
+from .retrieval import bump_retrieval_version
 
 logger = logging.getLogger(__name__)
 
 
-def save_property_embeddings(property_instance, chunks):
+def _lock_document(document):
+    # Row lock, so two swaps of one document's chunks can never interleave
+    # their deletes and inserts even if the ingestion lock has expired
+    list(
+        Document.objects.select_for_update()
+        .filter(pk=document.pk)
+        .values_list("pk", flat=True)
+    )
+
+
+def embed_document_chunks(document, chunks, generation):
     """
-    Generate and save embeddings for each chunk of a property's document.
+    Generate embeddings for each chunk of a property document with the given
+    generation's model, one API request per batch.
+    Returns unsaved PropertyEmbedding rows for the chunks that succeeded.
     """
-    for chunk in chunks:
+    chunks = [chunk for chunk in chunks if chunk.text]
+    batch_size = settings.EMBEDDING_BATCH_SIZE
+    rows = []
+    for start in range(0, len(chunks), batch_size):
+        batch = chunks[start : start + batch_size]
         try:
-            if not chunk:
-                logger.warning("Skipping empty chunck")
+            embeddings = generate_embeddings(
+                [chunk.text for chunk in batch],
+                model=generation.model_name,
+                dimensions=generation.dimensions,
+            )
+            if not embeddings:
+                logger.warning(
+                    f"Embedding generation returned None for {len(batch)} chunks"
+                )
                 continue
-
-            embedding = generate_embeddling(chunk)
-            if embedding:
-                PropertyEmbedding.objects.create(
-                    property=property_instance, chunk=chunk, embedding=embedding
+            rows.extend(
+                PropertyEmbedding(
+                    property_id=document.property_id,
+                    document=document,
+                    page_start=chunk.page_start,
+                    page_end=chunk.page_end,
+                    chunk=chunk.text,
+                    embedding=embedding,
+                    model_name=generation.model_name,
+                    dimensions=generation.dimensions,
                 )
-            else:
-                logger.warning(f"Embedding generation returned None for chunk: {chunk}")
+                for chunk, embedding in zip(batch, embeddings)
+                if embedding
+            )
         except Exception as e:
             logger.error(f"Error in property embedding: {e}", exc_info=True)
+    return rows
+
+
+def replace_document_embeddings(document, rows):
+    """
+    Swap a document's chunks, in every generation, for new ones in a single
+    transaction so readers see either the old set or the new one, never both,
+    then invalidate retrieval caches.
+    """
+    with transaction.atomic():
+        _lock_document(document)
+        PropertyEmbedding.objects.filter(document=document).delete()
+        PropertyEmbedding.objects.bulk_create(
+            rows, batch_size=settings.EMBEDDING_BATCH_SIZE
+        )
+        transaction.on_commit(lambda: bump_retrieval_version(document.property_id))
+    return len(rows)
+
+
+def _column(field_name):
+    return connection.ops.quote_name(
+        PropertyEmbedding._meta.get_field(field_name).column
+    )
+
+
+def copy_document_embeddings(source, document, generations):
+    """
+    Give `document` the chunks of an identical, already-processed `source` with
+    a single INSERT ... SELECT, so vectors are copied inside the database and
+    never round-trip through Python or the embeddings API. The rows are copied
+    rather than shared: retrieval selects chunks by their property, and each
+    document's chunks are replaced and purged on their own.
+    Returns the number of chunks copied in the first (active) generation.
+    """
+    table = connection.ops.quote_name(PropertyEmbedding._meta.db_table)
+    copied = [
+        "page_start",
+        "page_end",
+        "chunk",
+        "embedding",
+        "model_name",
+        "dimensions",
+    ]
+    target = ["created_at", "last_updated", "property", "document", *copied]
+    generation_filter = " OR ".join(
+        f"({_column('model_name')} = %s AND {_column('dimensions')} = %s)"
+        for _ in generations
+    )
+    now = timezone.now()
+    params = [now, now, document.property_id, document.id, source.id]
+    for generation in generations:
+        params += [generation.model_name, generation.dimensions]
+
+    with transaction.atomic():
+        _lock_document(document)
+        PropertyEmbedding.objects.filter(document=document).delete()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} ({', '.join(_column(name) for name in target)}) "
+                f"SELECT %s, %s, %s, %s, {', '.join(_column(name) for name in copied)} "
+                f"FROM {table} WHERE {_column('document')} = %s "
+                f"AND ({generation_filter})",
+                params,
+            )
+        transaction.on_commit(lambda: bump_retrieval_version(document.property_id))
+    active = generations[0]
+    return PropertyEmbedding.objects.filter(
+        document=document,
+        model_name=active.model_name,
+        dimensions=active.dimensions,
+    ).count()
@@ -0,0 +1,101 @@
+import re
+from bisect import bisect_right
+from collections import namedtuple
+from functools import lru_cache
+
+import tiktoken
+from django.conf import settings
+
+# Whitespace collapsing and non-ASCII removal run as C-level str methods, which
+# beat a combined regex whose per-match callback dominates on large documents.
+# The lookahead keeps single letters from being captured and rewritten.
+_REPEATED_LETTERS_RE = re.compile(r"([a-zA-Z])(?=\1\1)\1+")
+_DOUBLE_SPACE_RE = re.compile(r"  +")
+
+Chunk = namedtuple("Chunk", ["text", "page_start", "page_end"])
+
+
+def clean_text(text):
+    """
+    Cleans extracted text by collapsing whitespace, removing non-ASCII characters,
+    fixing repeated OCR letters and replacing `//` with commas.
+    """
+    text = " ".join(text.split())
+    text = text.encode("ascii", "ignore").decode("ascii")
+    text = _DOUBLE_SPACE_RE.sub(" ", text)  # Gaps left by dropped characters
+    text = _REPEATED_LETTERS_RE.sub(r"\1", text)
+    return text.replace("//", ", ").strip()
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model=None):
+    """
+    Return the tokenizer used by the embedding model.
+    """
+    return tiktoken.encoding_for_model(model or settings.EMBEDDING_MODEL)
+
+
+def count_tokens(text, model=None):
+    """
+    Count model tokens in text, which is what embedding input limits are based on.
+    """
+    return len(get_encoding(model).encode_ordinary(text))
+
+
+def _token_windows(token_count, max_tokens=None, overlap=None):
+    """
+    Yield (start, end) token windows of at most `max_tokens`, where consecutive
+    windows share `overlap` tokens so facts on a boundary are not lost.
+    """
+    max_tokens = max_tokens or settings.EMBEDDING_CHUNK_TOKENS
+    overlap = settings.EMBEDDING_CHUNK_OVERLAP if overlap is None else overlap
+    if not 0 <= overlap < max_tokens:
+        raise ValueError("Chunk overlap must be smaller than the chunk size.")
+
+    for start in range(0, token_count, max_tokens - overlap):
+        end = min(start + max_tokens, token_count)
+        yield start, end
+        if end == token_count:
+            break
+
+
+def split_into_chunks(text, max_tokens=None, overlap=None, model=None):
+    """
+    Splits already cleaned text into chunks of at most `max_tokens` model tokens.
+    """
+    encoding = get_encoding(model)
+    tokens = encoding.encode_ordinary(text)
+    chunks = []
+    for start, end in _token_windows(len(tokens), max_tokens, overlap):
+        chunk = encoding.decode(tokens[start:end]).strip()
+        if chunk:
+            chunks.append(chunk)
+    return chunks
+
+
+def split_pages_into_chunks(pages, max_tokens=None, overlap=None, model=None):
+    """
+    Chunks already cleaned per-page text like `split_into_chunks`, tagging every
+    chunk with the 1-based page range it was taken from.
+    """
+    encoding = get_encoding(model)
+    tokens, page_starts, page_numbers = [], [], []
+    for number, page in enumerate(pages, start=1):
+        if not page:
+            continue
+        page_starts.append(len(tokens))
+        page_numbers.append(number)
+        tokens.extend(encoding.encode_ordinary(f" {page}" if tokens else page))
+
+    chunks = []
+    for start, end in _token_windows(len(tokens), max_tokens, overlap):
+        text = encoding.decode(tokens[start:end]).strip()
+        if text:
+            chunks.append(
+                Chunk(
+                    text=text,
+                    page_start=page_numbers[bisect_right(page_starts, start) - 1],
+                    page_end=page_numbers[bisect_right(page_starts, end - 1) - 1],
+                )
+            )
+    return chunks
@@ -0,0 +1,250 @@
+import random
+import resource
+import shutil
+import tempfile
+import time
+from collections import defaultdict
+from unittest import mock
+
+import fitz
+import numpy as np
+from django.conf import settings
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import override_settings
+
+from apps.ai_assistant.ai_functions import save_function
+from apps.ai_assistant.ai_functions.ingestion import run_ingestion
+from apps.ai_assistant.models import DocumentIngestionJob
+from apps.properties.models import Document, Property
+
+from .benchmark_text_processing import SAMPLE_DEED_PARAGRAPH
+
+KINDS = ["typed", "scanned", "mixed"]
+# Order the pipeline runs in; stages a document skips are left out of its time
+STAGES = [
+    "fingerprint",
+    "preflight",
+    "extract",
+    "ocr",
+    "clean",
+    "chunk",
+    "embed",
+    "persist",
+]
+
+
+def _page_text(document_number, page_number):
+    """
+    Deed-like text that differs per page, so no two generated files are
+    identical and none is skipped as a duplicate.
+    """
+    plot = random.randint(100, 5000)
+    return (
+        f"Document {document_number}, page {page_number}. Plot {plot} sqm.\n"
+        + SAMPLE_DEED_PARAGRAPH * 6
+    )
+
+
+def _scanned_page(pdf, text, dpi):
+    """
+    Add a page that is only an image of text, like a scan without a text layer.
+    """
+    source = fitz.open()
+    page = source.new_page()
+    page.insert_textbox(fitz.Rect(50, 50, 550, 800), text, fontsize=10)
+    pixmap = page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY)
+    target = pdf.new_page()
+    target.insert_image(target.rect, pixmap=pixmap)
+
+
+def generate_pdf(path, kind, pages, document_number, dpi):
+    pdf = fitz.open()
+    for page_number in range(1, pages + 1):
+        text = _page_text(document_number, page_number)
+        if kind == "scanned" or (kind == "mixed" and page_number % 2 == 0):
+            _scanned_page(pdf, text, dpi)
+        else:
+            pdf.new_page().insert_textbox(
+                fitz.Rect(50, 50, 550, 800), text, fontsize=10
+            )
+    pdf.save(path, deflate=True)
+
+
+def _max_rss_mb(who):
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(who).ru_maxrss / 1024
+
+
+class Command(BaseCommand):
+    help = (
+        "Run generated typed, scanned and mixed PDFs through the full ingestion "
+        "pipeline with a local embedding stub and report per-stage throughput, "
+        "peak RSS and CPU use of one worker. Nothing is kept: the run is rolled "
+        "back and files are written to a temporary directory."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--documents", type=int, default=3, help="Per kind")
+        parser.add_argument("--pages", type=int, default=10)
+        parser.add_argument("--kinds", nargs="+", choices=KINDS, default=KINDS)
+        parser.add_argument(
+            "--dpi", type=int, default=150, help="Resolution of scanned pages"
+        )
+        parser.add_argument(
+            "--embed-latency",
+            type=float,
+            default=0.0,
+            help="Seconds the stub embedder sleeps per request, to mimic the API",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        needs_ocr = set(options["kinds"]) & {"scanned", "mixed"}
+        missing = [tool for tool in ["tesseract", "pdftoppm"] if not shutil.which(tool)]
+        if needs_ocr and missing:
+            raise CommandError(
+                f"OCR needs {', '.join(missing)} on PATH; run with --kinds typed "
+                "to benchmark without OCR."
+            )
+        random.seed(options["seed"])
+        self.rng = np.random.default_rng(options["seed"])
+        self.embed_latency = options["embed_latency"]
+
+        with tempfile.TemporaryDirectory() as workdir:
+            start = time.perf_counter()
+            files = []
+            for kind in options["kinds"]:
+                for number in range(options["documents"]):
+                    path = f"{workdir}/{kind}_{number}.pdf"
+                    generate_pdf(path, kind, options["pages"], number, options["dpi"])
+                    files.append((kind, path))
+            self.stdout.write(
+                f"Generated {len(files)} PDFs of {options['pages']} pages "
+                f"in {time.perf_counter() - start:.1f}s"
+            )
+
+            with (
+                override_settings(MEDIA_ROOT=f"{workdir}/media"),
+                mock.patch.object(
+                    save_function, "generate_embeddings", self.stub_embeddings
+                ),
+            ):
+                jobs, usage = self.run_pipeline(files)
+        self.report(jobs, usage)
+
+    def stub_embeddings(self, texts, model=None, dimensions=None):
+        if self.embed_latency:
+            time.sleep(self.embed_latency)
+        dimensions = dimensions or settings.EMBEDDING_DIMENSIONS
+        return self.rng.random((len(texts), dimensions), dtype=np.float32).tolist()
+
+    def run_pipeline(self, files):
+        rss_before = _max_rss_mb(resource.RUSAGE_SELF)
+        cpu_before = [
+            resource.getrusage(who)
+            for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN)
+        ]
+        wall_start = time.perf_counter()
+        jobs = []
+        # Rolled back at the end, which also drops the on_commit hooks that
+        # would queue Celery tasks for the benchmark documents
+        with transaction.atomic():
+            property_instance = Property.objects.create(
+                title="Ingestion benchmark", price=0, property_type="house"
+            )
+            for kind, path in files:
+                with open(path, "rb") as f:
+                    document = Document.objects.create(
+                        property=property_instance,
+                        document_type="title_deed",
+                        file=File(f, name=path.rsplit("/", 1)[-1]),
+                    )
+                # The job the upload signal queued; a worker would pick up this one
+                job = DocumentIngestionJob.objects.filter(document=document).latest(
+                    "id"
+                )
+                started = time.perf_counter()
+                run_ingestion(job)
+                jobs.append((kind, job, time.perf_counter() - started))
+                self.stdout.write(
+                    f"  {kind:8} {job.status:9} {job.page_count:4} pages "
+                    f"{job.chunk_count:5} chunks {jobs[-1][2]:7.2f}s"
+                )
+            transaction.set_rollback(True)
+
+        wall = time.perf_counter() - wall_start
+        cpu_after = [
+            resource.getrusage(who)
+            for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN)
+        ]
+        self_cpu, children_cpu = (
+            (after.ru_utime + after.ru_stime) - (before.ru_utime + before.ru_stime)
+            for before, after in zip(cpu_before, cpu_after)
+        )
+        usage = {
+            "wall": wall,
+            "self_cpu": self_cpu,
+            "children_cpu": children_cpu,
+            "rss_before": rss_before,
+            "rss_peak": _max_rss_mb(resource.RUSAGE_SELF),
+            "children_rss_peak": _max_rss_mb(resource.RUSAGE_CHILDREN),
+        }
+        return jobs, usage
+
+    def report(self, jobs, usage):
+        failed = [(kind, job) for kind, job, _ in jobs if job.status != "succeeded"]
+        for kind, job in failed:
+            self.stdout.write(self.style.ERROR(f"{kind} document failed: {job.error}"))
+
+        self.stdout.write(
+            "\nkind      docs  pages  chunks   seconds  docs/hour  pages/s"
+        )
+        by_kind = defaultdict(list)
+        for kind, job, seconds in jobs:
+            by_kind[kind].append((job, seconds))
+        for kind, runs in by_kind.items():
+            pages = sum(job.page_count for job, _ in runs)
+            chunks = sum(job.chunk_count for job, _ in runs)
+            seconds = sum(seconds for _, seconds in runs)
+            self.stdout.write(
+                f"{kind:8} {len(runs):5} {pages:6} {chunks:7} {seconds:9.2f} "
+                f"{len(runs) / seconds * 3600:10.0f} {pages / seconds:8.1f}"
+            )
+
+        stage_seconds, stage_pages = defaultdict(float), defaultdict(int)
+        for _, job, _ in jobs:
+            for stage, info in job.stages.items():
+                if info.get("seconds") is not None:
+                    stage_seconds[stage] += info["seconds"]
+                    stage_pages[stage] += job.page_count
+        total = sum(stage_seconds.values()) or 1e-9
+        self.stdout.write("\nstage        seconds  share  pages/s")
+        for stage in [s for s in STAGES if s in stage_seconds] + sorted(
+            set(stage_seconds) - set(STAGES)
+        ):
+            seconds = stage_seconds[stage]
+            rate = stage_pages[stage] / seconds if seconds else float("inf")
+            self.stdout.write(
+                f"{stage:11} {seconds:8.2f} {seconds / total:6.0%} {rate:8.1f}"
+            )
+
+        wall = usage["wall"]
+        cpu = usage["self_cpu"] + usage["children_cpu"]
+        self.stdout.write(
+            f"\nPeak RSS: {usage['rss_peak']:.0f} MB worker "
+            f"({usage['rss_before']:.0f} MB before ingestion), "
+            f"{usage['children_rss_peak']:.0f} MB largest OCR subprocess"
+        )
+        self.stdout.write(
+            f"CPU: {cpu / wall:.0%} of one core over {wall:.1f}s "
+            f"(worker {usage['self_cpu']:.1f}s, subprocesses {usage['children_cpu']:.1f}s)"
+        )
+        succeeded = len(jobs) - len(failed)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"One worker ingests about {succeeded / wall * 3600:.0f} documents/hour "
+                f"of this mix"
+            )
+        )
@@ -0,0 +1,61 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.ai_assistant.ai_functions.text_processing import (
+    clean_text,
+    split_into_chunks,
+)
+
+# A deed-like paragraph with the usual extraction noise: broken lines, double
+# spaces, currency symbols, OCR letter repeats and `//` separators.
+SAMPLE_DEED_PARAGRAPH = (
+    "THIS DEED OF ASSIGNMENT is made this 12th day of March 2021 BETWEEN\n"
+    "Mr. Adebayo Ogunleye  of No. 14 Admiralty Way, Lekki Phase 1 // Lagos State\n"
+    "(hereinafter called the ASSIGNOR) and Mrs. Chioma Okafor (the ASSIGNEE).\n"
+    "In consideration of the sum of ₦25,000,000.00 the Assignor assigns all\n"
+    "that parcel of land measuring   648 sqm  free from all encumbrancesss and\n"
+    "covered by Certificate of Occupancy No. LA/2019/ C-of-O/0042.\n\n"
+)
+
+
+class Command(BaseCommand):
+    help = "Measure clean_text and split_into_chunks throughput in MB/s on a large synthetic deed"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size-mb", type=float, default=10.0)
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--chunk-tokens", type=int, default=None)
+        parser.add_argument("--overlap", type=int, default=None)
+
+    def handle(self, *args, **options):
+        size_bytes = int(options["size_mb"] * 1024 * 1024)
+        copies = max(1, size_bytes // len(SAMPLE_DEED_PARAGRAPH.encode()))
+        document = SAMPLE_DEED_PARAGRAPH * copies
+        size_mb = len(document.encode()) / (1024 * 1024)
+
+        # Warm up the tokenizer so its one-off load is not timed
+        split_into_chunks("warm up", options["chunk_tokens"], options["overlap"])
+
+        clean_times, chunk_times = [], []
+        for _ in range(options["repeat"]):
+            start = time.perf_counter()
+            cleaned = clean_text(document)
+            clean_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            chunks = split_into_chunks(
+                cleaned, options["chunk_tokens"], options["overlap"]
+            )
+            chunk_times.append(time.perf_counter() - start)
+
+        clean_best = min(clean_times)
+        chunk_best = min(chunk_times)
+        self.stdout.write(f"Document size: {size_mb:.1f} MB, {len(chunks)} chunks")
+        self.stdout.write(f"clean_text:        {size_mb / clean_best:8.1f} MB/s")
+        self.stdout.write(f"split_into_chunks: {size_mb / chunk_best:8.1f} MB/s")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"End to end:        {size_mb / (clean_best + chunk_best):8.1f} MB/s"
+            )
+        )
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from apps.ai_assistant.ai_functions.listing_search import embed_listings
+from apps.properties.models import Property
+
+
+class Command(BaseCommand):
+    help = (
+        "Embed the listing text of every property for semantic listing search. "
+        "Listings whose text has not changed are skipped, so it is safe to rerun."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch, checked, embedded = [], 0, 0
+        for property_instance in Property.objects.order_by("id").iterator(
+            chunk_size=options["batch_size"]
+        ):
+            batch.append(property_instance)
+            if len(batch) == options["batch_size"]:
+                embedded += embed_listings(batch)
+                checked += len(batch)
+                batch = []
+                self.stdout.write(f"{checked} listings checked, {embedded} embedded")
+        if batch:
+            embedded += embed_listings(batch)
+            checked += len(batch)
+        self.stdout.write(
+            self.style.SUCCESS(f"{checked} listings checked, {embedded} embedded")
+        )
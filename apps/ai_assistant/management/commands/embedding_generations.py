@@ -0,0 +1,88 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.ai_assistant.ai_functions.generations import (
+    backfill_generation,
+    cleanup_retired_generations,
+    cutover,
+    get_active_generation,
+    missing_chunk_groups,
+    start_generation,
+)
+from apps.ai_assistant.models import EmbeddingGeneration
+from apps.ai_assistant.tasks import backfill_embedding_generation
+
+
+class Command(BaseCommand):
+    help = (
+        "Migrate embeddings to a new model or dimension without downtime: "
+        "start (dual-write + backfill), status, cutover, cleanup."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "action", choices=["start", "status", "backfill", "cutover", "cleanup"]
+        )
+        parser.add_argument("--model", help="Embedding model for `start`")
+        parser.add_argument("--dimensions", type=int, help="Output size for `start`")
+        parser.add_argument(
+            "--sync",
+            action="store_true",
+            help="Backfill in this process instead of on a Celery worker",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Cut over even if some documents are not backfilled yet",
+        )
+
+    def handle(self, *args, **options):
+        getattr(self, f"handle_{options['action']}")(options)
+
+    def get_backfilling(self):
+        generation = EmbeddingGeneration.objects.filter(status="backfilling").first()
+        if not generation:
+            raise CommandError("No embedding generation is backfilling.")
+        return generation
+
+    def handle_start(self, options):
+        if not options["model"] or not options["dimensions"]:
+            raise CommandError("`start` needs --model and --dimensions.")
+        try:
+            generation = start_generation(options["model"], options["dimensions"])
+        except ValueError as e:
+            raise CommandError(str(e))
+        self.stdout.write(f"New uploads are now dual-written to {generation}")
+        self.handle_backfill(options)
+
+    def handle_backfill(self, options):
+        generation = self.get_backfilling()
+        if options["sync"]:
+            written = backfill_generation(generation)
+            self.stdout.write(self.style.SUCCESS(f"Backfilled {written} chunks"))
+        else:
+            backfill_embedding_generation.delay(generation.id)
+            self.stdout.write(self.style.SUCCESS(f"Queued backfill of {generation}"))
+
+    def handle_status(self, options):
+        self.stdout.write(f"Reads: {get_active_generation()}")
+        for generation in EmbeddingGeneration.objects.exclude(status="active"):
+            line = f"{generation}: {generation.embeddings.count()} chunks"
+            if generation.status == "backfilling":
+                line += f", {len(missing_chunk_groups(generation))} documents missing"
+            self.stdout.write(line)
+
+    def handle_cutover(self, options):
+        generation = self.get_backfilling()
+        missing = len(missing_chunk_groups(generation))
+        if missing and not options["force"]:
+            raise CommandError(
+                f"{missing} documents are not backfilled yet; run `backfill` or pass --force."
+            )
+        cutover(generation)
+        self.stdout.write(self.style.SUCCESS(f"Reads now use {generation}"))
+
+    def handle_cleanup(self, options):
+        deleted = cleanup_retired_generations()
+        self.stdout.write(
+            self.style.SUCCESS(f"Deleted {deleted} chunks of retired generations")
+        )
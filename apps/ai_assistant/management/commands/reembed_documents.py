@@ -0,0 +1,175 @@
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Count
+
+from apps.ai_assistant.ai_functions.ingestion import (
+    drop_unlinked_chunks,
+    reingest_document,
+)
+from apps.ai_assistant.ai_functions.rate_limiter import embedding_rate_limiter
+from apps.properties.models import Document
+from services import DOCUMENT_TYPE_CHOICES
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-run documents through ingestion with bounded concurrency, resuming "
+        "from the last checkpoint. Each document swaps its own embeddings. "
+        "Unfiltered runs also drop chunks not linked to any document once every "
+        "document of their property has been re-embedded."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--property-id", type=int, nargs="+")
+        parser.add_argument(
+            "--document-type", choices=[choice for choice, _ in DOCUMENT_TYPE_CHOICES]
+        )
+        parser.add_argument(
+            "--since", help="Only documents uploaded on or after this date (YYYY-MM-DD)"
+        )
+        parser.add_argument("--concurrency", type=int, default=4)
+        parser.add_argument("--checkpoint", default="reembed_checkpoint.json")
+        parser.add_argument(
+            "--restart", action="store_true", help="Ignore an existing checkpoint"
+        )
+        parser.add_argument(
+            "--report-every", type=float, default=30.0, help="Seconds between reports"
+        )
+
+    def handle(self, *args, **options):
+        self.checkpoint_path = options["checkpoint"]
+        self.state = self.load_checkpoint(options["restart"])
+
+        # Documents of deleted properties are purged, not re-embedded
+        documents = Document.objects.filter(property__deleted_at__isnull=True)
+        if options["property_id"]:
+            documents = documents.filter(property_id__in=options["property_id"])
+        if options["document_type"]:
+            documents = documents.filter(document_type=options["document_type"])
+        if options["since"]:
+            documents = documents.filter(created_at__date__gte=options["since"])
+        filtered = any(
+            options[name] for name in ("property_id", "document_type", "since")
+        )
+        documents = documents.filter(pk__gt=self.state["last_document_id"]).order_by(
+            "pk"
+        )
+        total = documents.count()
+        # Documents left per property, so its unlinked chunks are dropped only
+        # after every one of them has been re-embedded
+        remaining = {
+            row["property_id"]: row["count"]
+            for row in documents.order_by()
+            .values("property_id")
+            .annotate(count=Count("pk"))
+        }
+        failed_property_ids = set(
+            Document.objects.filter(
+                pk__in=self.state["failed_document_ids"]
+            ).values_list("property_id", flat=True)
+        )
+        if self.state["last_document_id"]:
+            self.stdout.write(
+                f"Resuming after document {self.state['last_document_id']}"
+            )
+        self.stdout.write(f"{total} documents to re-embed")
+
+        concurrency = max(1, options["concurrency"])
+        started = time.monotonic()
+        last_report = started
+        done = chunks = 0
+        pending = set()
+        in_flight = {}
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+
+            def drain(block_until_below):
+                nonlocal done, chunks, last_report
+                while len(in_flight) > block_until_below:
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        document_id, property_id = in_flight.pop(future)
+                        pending.discard(document_id)
+                        succeeded, chunk_count = future.result()
+                        done += 1
+                        chunks += chunk_count
+                        if not succeeded:
+                            self.state["failed_document_ids"].append(document_id)
+                            failed_property_ids.add(property_id)
+                        remaining[property_id] -= 1
+                        if (
+                            not filtered
+                            and not remaining[property_id]
+                            and property_id not in failed_property_ids
+                        ):
+                            drop_unlinked_chunks(property_id)
+                    self.state["processed"] += len(finished)
+                    self.state["last_document_id"] = (
+                        min(pending) - 1 if pending else last_submitted
+                    )
+                    self.save_checkpoint()
+                    if time.monotonic() - last_report >= options["report_every"]:
+                        self.report(done, total, chunks, started)
+                        last_report = time.monotonic()
+
+            last_submitted = self.state["last_document_id"]
+            for document in documents.iterator():
+                drain(block_until_below=concurrency * 2 - 1)
+                pending.add(document.pk)
+                last_submitted = document.pk
+                future = pool.submit(self.reembed_document, document)
+                in_flight[future] = (document.pk, document.property_id)
+            drain(block_until_below=0)
+
+        self.report(done, total, chunks, started)
+        failed = self.state["failed_document_ids"]
+        if failed:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{len(failed)} documents failed and kept their old embeddings: "
+                    f"{failed}"
+                )
+            )
+        self.stdout.write(self.style.SUCCESS(f"Re-embedded {done} documents"))
+
+    def reembed_document(self, document):
+        try:
+            job = reingest_document(document)
+            succeeded = job.status == "succeeded"
+            return succeeded, job.chunk_count if succeeded else 0
+        except Exception as e:
+            self.stderr.write(f"Document {document.pk} failed: {e}")
+            return False, 0
+        finally:
+            # Worker threads open their own connections; do not leak them
+            connection.close()
+
+    def report(self, done, total, chunks, started):
+        elapsed = max(time.monotonic() - started, 1e-6)
+        rate = done / elapsed
+        eta = (total - done) / rate if rate else 0
+        self.stdout.write(
+            f"{done}/{total} documents | {rate * 3600:.0f} documents/h | "
+            f"{chunks / elapsed:.1f} chunks/s | "
+            f"{len(self.state['failed_document_ids'])} failed | "
+            f"{embedding_rate_limiter.throttled} rate-limit waits | ETA {eta / 60:.0f} min"
+        )
+
+    def load_checkpoint(self, restart):
+        state = {"last_document_id": 0, "processed": 0, "failed_document_ids": []}
+        if not restart and os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path) as f:
+                state.update(json.load(f))
+        return state
+
+    def save_checkpoint(self):
+        # Write then rename so a crash never leaves a truncated checkpoint
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.checkpoint_path)
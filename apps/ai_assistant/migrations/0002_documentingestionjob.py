@@ -0,0 +1,75 @@
+# Generated by Django 5.1.7 on 2026-10-19 14:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai_assistant", "0001_initial"),
+        ("properties", "0002_remove_property_image_remove_property_latitude_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DocumentIngestionJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("last_updated", models.DateTimeField(auto_now=True)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("running", "Running"),
+                            ("succeeded", "Succeeded"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "current_stage",
+                    models.CharField(
+                        blank=True,
+                        choices=[
+                            ("extract", "Text Extraction"),
+                            ("ocr", "OCR"),
+                            ("clean", "Cleaning"),
+                            ("chunk", "Chunking"),
+                            ("embed", "Embedding"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("stages", models.JSONField(blank=True, default=dict)),
+                ("page_count", models.PositiveIntegerField(default=0)),
+                ("chunk_count", models.PositiveIntegerField(default=0)),
+                ("error", models.TextField(blank=True)),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "document",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ingestion_jobs",
+                        to="properties.document",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
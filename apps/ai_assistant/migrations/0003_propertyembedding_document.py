@@ -0,0 +1,57 @@
+# Generated by Django 5.1.7 on 2026-10-19 14:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def link_single_document_embeddings(apps, schema_editor):
+    """
+    Chunks of a property with exactly one document can only have come from it.
+    """
+    Document = apps.get_model("properties", "Document")
+    PropertyEmbedding = apps.get_model("ai_assistant", "PropertyEmbedding")
+    single_documents = (
+        Document.objects.values("property_id")
+        .annotate(documents=Count("id"), document_id=Min("id"))
+        .filter(documents=1)
+    )
+    for row in single_documents.iterator():
+        PropertyEmbedding.objects.filter(
+            property_id=row["property_id"], document__isnull=True
+        ).update(document_id=row["document_id"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai_assistant", "0002_documentingestionjob"),
+        ("properties", "0002_remove_property_image_remove_property_latitude_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="propertyembedding",
+            name="document",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="embeddings",
+                to="properties.document",
+            ),
+        ),
+        migrations.AddField(
+            model_name="propertyembedding",
+            name="page_end",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="propertyembedding",
+            name="page_start",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(
+            link_single_document_embeddings, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.1.7 on 2026-10-19 14:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai_assistant", "0003_propertyembedding_document"),
+        ("properties", "0002_remove_property_image_remove_property_latitude_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EmbeddingGeneration",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("last_updated", models.DateTimeField(auto_now=True)),
+                ("model_name", models.CharField(max_length=100)),
+                ("dimensions", models.PositiveIntegerField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("active", "Active"),
+                            ("backfilling", "Backfilling"),
+                            ("retired", "Retired"),
+                        ],
+                        default="backfilling",
+                        max_length=20,
+                    ),
+                ),
+                ("activated_at", models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="propertyembedding",
+            name="dimensions",
+            field=models.PositiveIntegerField(default=1536),
+        ),
+        migrations.AddField(
+            model_name="propertyembedding",
+            name="model_name",
+            field=models.CharField(default="text-embedding-ada-002", max_length=100),
+        ),
+        migrations.AddIndex(
+            model_name="propertyembedding",
+            index=models.Index(
+                fields=["property", "model_name", "dimensions"],
+                name="embedding_property_gen_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="embeddinggeneration",
+            constraint=models.UniqueConstraint(
+                fields=("model_name", "dimensions"), name="unique_embedding_generation"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="embeddinggeneration",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("status", "active")),
+                fields=("status",),
+                name="single_active_embedding_generation",
+            ),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.1.7 on 2026-10-19 14:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai_assistant", "0004_embedding_generations"),
+        ("properties", "0003_document_content_hash"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="documentingestionjob",
+            name="reused_from",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="properties.document",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="documentingestionjob",
+            name="current_stage",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("fingerprint", "Fingerprinting"),
+                    ("reuse", "Duplicate Reuse"),
+                    ("extract", "Text Extraction"),
+                    ("ocr", "OCR"),
+                    ("clean", "Cleaning"),
+                    ("chunk", "Chunking"),
+                    ("embed", "Embedding"),
+                ],
+                max_length=20,
+            ),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.1.7 on 2026-10-19 14:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai_assistant", "0005_documentingestionjob_reused_from"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="documentingestionjob",
+            name="estimated_seconds",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="documentingestionjob",
+            name="extraction_plan",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("text", "Text Layer"),
+                    ("ocr", "OCR"),
+                    ("mixed", "Text Layer and OCR"),
+                ],
+                max_length=10,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="documentingestionjob",
+            name="current_stage",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("fingerprint", "Fingerprinting"),
+                    ("reuse", "Duplicate Reuse"),
+                    ("preflight", "Preflight"),
+                    ("extract", "Text Extraction"),
+                    ("ocr", "OCR"),
+                    ("clean", "Cleaning"),
+                    ("chunk", "Chunking"),
+                    ("embed", "Embedding"),
+                ],
+                max_length=20,
+            ),
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 5.1.7 on 2026-10-19 14:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai_assistant", "0006_documentingestionjob_extraction_plan"),
+        ("properties", "0003_document_content_hash"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="documentingestionjob",
+            name="current_stage",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("fingerprint", "Fingerprinting"),
+                    ("reuse", "Duplicate Reuse"),
+                    ("preflight", "Preflight"),
+                    ("stored_text", "Stored Text"),
+                    ("extract", "Text Extraction"),
+                    ("ocr", "OCR"),
+                    ("clean", "Cleaning"),
+                    ("chunk", "Chunking"),
+                    ("embed", "Embedding"),
+                ],
+                max_length=20,
+            ),
+        ),
+        migrations.CreateModel(
+            name="DocumentText",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("last_updated", models.DateTimeField(auto_now=True)),
+                ("content_hash", models.CharField(max_length=64)),
+                ("extractor_version", models.CharField(max_length=20)),
+                (
+                    "extraction_plan",
+                    models.CharField(
+                        blank=True,
+                        choices=[
+                            ("text", "Text Layer"),
+                            ("ocr", "OCR"),
+                            ("mixed", "Text Layer and OCR"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("page_count", models.PositiveIntegerField(default=0)),
+                ("compressed_pages", models.BinaryField()),
+                (
+                    "document",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="extracted_text",
+                        to="properties.document",
+                    ),
+                ),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.1.7 on 2026-10-19 14:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai_assistant", "0007_documenttext"),
+        ("properties", "0003_document_content_hash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PropertyFactSheet",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("last_updated", models.DateTimeField(auto_now=True)),
+                ("content", models.TextField()),
+                ("token_count", models.PositiveIntegerField(default=0)),
+                ("source_hash", models.CharField(max_length=64)),
+                ("model_name", models.CharField(max_length=100)),
+                (
+                    "property",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="fact_sheet",
+                        to="properties.property",
+                    ),
+                ),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+    ]
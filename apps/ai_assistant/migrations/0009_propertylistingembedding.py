@@ -0,0 +1,50 @@
+# Generated by Django 5.1.7 on 2026-10-19 15:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai_assistant", "0008_propertyfactsheet"),
+        ("properties", "0003_document_content_hash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PropertyListingEmbedding",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("last_updated", models.DateTimeField(auto_now=True)),
+                ("text_hash", models.CharField(max_length=64)),
+                ("embedding", models.BinaryField()),
+                ("model_name", models.CharField(max_length=100)),
+                ("dimensions", models.PositiveIntegerField()),
+                (
+                    "property",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="listing_embedding",
+                        to="properties.property",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["last_updated"], name="listing_embedding_updated_idx"
+                    )
+                ],
+            },
+        ),
+    ]
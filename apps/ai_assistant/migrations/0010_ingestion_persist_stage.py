@@ -0,0 +1,33 @@
+# Generated by Django 5.1.7 on 2026-10-19 15:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai_assistant", "0009_propertylistingembedding"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="documentingestionjob",
+            name="current_stage",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("fingerprint", "Fingerprinting"),
+                    ("reuse", "Duplicate Reuse"),
+                    ("preflight", "Preflight"),
+                    ("stored_text", "Stored Text"),
+                    ("extract", "Text Extraction"),
+                    ("ocr", "OCR"),
+                    ("clean", "Cleaning"),
+                    ("chunk", "Chunking"),
+                    ("embed", "Embedding"),
+                    ("persist", "Persisting"),
+                ],
+                max_length=20,
+            ),
+        ),
+    ]
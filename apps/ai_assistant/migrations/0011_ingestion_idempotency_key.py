@@ -0,0 +1,27 @@
+# Generated by Django 5.1.7 on 2026-10-19 15:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai_assistant", "0010_ingestion_persist_stage"),
+        ("properties", "0004_property_deleted_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="documentingestionjob",
+            name="idempotency_key",
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddConstraint(
+            model_name="documentingestionjob",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("idempotency_key", ""), _negated=True),
+                fields=("idempotency_key",),
+                name="unique_ingestion_idempotency_key",
+            ),
+        ),
+    ]
@@ -1,26 +1,141 @@
+import json
+import time
+import zlib
+from contextlib import contextmanager
+
 from django.conf import settings
 from django.contrib.postgres.fields import ArrayField
 from django.db import models
+from django.utils import timezone
 
 from apps.accounts.models import Audit
-from apps.properties.models import Property
+from apps.properties.models import Document, Property
+from services import (
+    EMBEDDING_GENERATION_STATUS_CHOICES,
+    EXTRACTION_PLAN_CHOICES,
+    INGESTION_STAGE_CHOICES,
+    INGESTION_STATUS_CHOICES,
+)
 
 # Create your models here.
 
 
+class EmbeddingGeneration(Audit):
+    """
+    An embedding model and output dimension. Reads use the single active
+    generation; a backfilling generation is written alongside it until cutover.
+    """
+
+    model_name = models.CharField(max_length=100)
+    dimensions = models.PositiveIntegerField()
+    status = models.CharField(
+        max_length=20,
+        choices=EMBEDDING_GENERATION_STATUS_CHOICES,
+        default="backfilling",
+    )
+    activated_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["model_name", "dimensions"], name="unique_embedding_generation"
+            ),
+            models.UniqueConstraint(
+                fields=["status"],
+                condition=models.Q(status="active"),
+                name="single_active_embedding_generation",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.model_name} ({self.dimensions}d) | {self.status}"
+
+    @property
+    def embeddings(self):
+        return PropertyEmbedding.objects.filter(
+            model_name=self.model_name, dimensions=self.dimensions
+        )
+
+
 class PropertyEmbedding(Audit):
     property = models.ForeignKey(
         Property, on_delete=models.CASCADE, related_name="embeddings"
     )
+    # Null only for chunks embedded before embeddings were tracked per document
+    document = models.ForeignKey(
+        Document,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="embeddings",
+    )
+    page_start = models.PositiveIntegerField(blank=True, null=True)
+    page_end = models.PositiveIntegerField(blank=True, null=True)
     chunk = models.TextField()  # This holds a part of the property document
     embedding = ArrayField(
         models.FloatField(), blank=True, null=True
     )  # The vector embedding of the chunk
+    model_name = models.CharField(max_length=100, default="text-embedding-ada-002")
+    dimensions = models.PositiveIntegerField(default=1536)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["property", "model_name", "dimensions"],
+                name="embedding_property_gen_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"Embedding for {self.property.title[:30]}... | {self.chunk[:30]}..."
 
 
+class PropertyFactSheet(Audit):
+    """
+    Compact facts about a property distilled from its documents, answering
+    most questions about properties with little document text without a
+    per-question retrieval.
+    """
+
+    property = models.OneToOneField(
+        Property, on_delete=models.CASCADE, related_name="fact_sheet"
+    )
+    content = models.TextField()
+    token_count = models.PositiveIntegerField(default=0)
+    # SHA-256 over the document texts the sheet was generated from
+    source_hash = models.CharField(max_length=64)
+    model_name = models.CharField(max_length=100)
+
+    def __str__(self):
+        return f"Fact sheet for {self.property.title}"
+
+
+class PropertyListingEmbedding(Audit):
+    """
+    Embedding of a property's listing text (title, type, bedrooms and
+    description) used by semantic listing search.
+    """
+
+    property = models.OneToOneField(
+        Property, on_delete=models.CASCADE, related_name="listing_embedding"
+    )
+    # SHA-256 of the embedded text; saves that do not change it are not re-embedded
+    text_hash = models.CharField(max_length=64)
+    # Unit-length float32 bytes, read straight into the in-memory search index
+    # without parsing every element of a float array
+    embedding = models.BinaryField()
+    model_name = models.CharField(max_length=100)
+    dimensions = models.PositiveIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["last_updated"], name="listing_embedding_updated_idx")
+        ]
+
+    def __str__(self):
+        return f"Listing embedding for {self.property.title}"
+
+
 class PropertyChatHistory(Audit):
     property = models.ForeignKey(
         Property, on_delete=models.CASCADE, related_name="chat_history"
@@ -37,3 +152,149 @@ class PropertyChatHistory(Audit):
 
     def __str__(self):
         return f"Chat on {self.property.title[:30]}... | Q: {self.question[:30]}..."
+
+
+class DocumentText(Audit):
+    """
+    Per-page text extracted from a document, before cleaning, stored
+    zlib-compressed so it can be re-cleaned and re-chunked without parsing the
+    file again.
+    """
+
+    document = models.OneToOneField(
+        Document, on_delete=models.CASCADE, related_name="extracted_text"
+    )
+    # The file content and extractor the text came from; stale if either changes
+    content_hash = models.CharField(max_length=64)
+    extractor_version = models.CharField(max_length=20)
+    extraction_plan = models.CharField(
+        max_length=10, choices=EXTRACTION_PLAN_CHOICES, blank=True
+    )
+    page_count = models.PositiveIntegerField(default=0)
+    compressed_pages = models.BinaryField()
+
+    def __str__(self):
+        return f"Text of document {self.document_id} | {self.page_count} pages"
+
+    @property
+    def pages(self):
+        return json.loads(zlib.decompress(self.compressed_pages))
+
+    @pages.setter
+    def pages(self, pages):
+        self.compressed_pages = zlib.compress(json.dumps(pages).encode())
+        self.page_count = len(pages)
+
+
+class DocumentIngestionJob(Audit):
+    """
+    One processing run of an uploaded document through extraction, OCR,
+    cleaning, chunking and embedding.
+    """
+
+    document = models.ForeignKey(
+        Document, on_delete=models.CASCADE, related_name="ingestion_jobs"
+    )
+    status = models.CharField(
+        max_length=20, choices=INGESTION_STATUS_CHOICES, default="pending"
+    )
+    current_stage = models.CharField(
+        max_length=20, choices=INGESTION_STAGE_CHOICES, blank=True
+    )
+    # {"extract": {"status": "succeeded", "seconds": 1.42}, ...}
+    stages = models.JSONField(default=dict, blank=True)
+    page_count = models.PositiveIntegerField(default=0)
+    chunk_count = models.PositiveIntegerField(default=0)
+    # Set when an identical, already-processed file supplied the chunks
+    reused_from = models.ForeignKey(
+        Document,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    extraction_plan = models.CharField(
+        max_length=10, choices=EXTRACTION_PLAN_CHOICES, blank=True
+    )
+    estimated_seconds = models.FloatField(blank=True, null=True)
+    error = models.TextField(blank=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    # One queued job per version of the document's file; see `ingestion_key`
+    idempotency_key = models.CharField(max_length=64, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["idempotency_key"],
+                condition=~models.Q(idempotency_key=""),
+                name="unique_ingestion_idempotency_key",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Ingestion of document {self.document_id} | {self.status}"
+
+    @property
+    def chat_ready(self):
+        return self.status == "succeeded" and self.chunk_count > 0
+
+    @property
+    def duration(self):
+        if not self.started_at:
+            return None
+        return ((self.finished_at or timezone.now()) - self.started_at).total_seconds()
+
+    def mark_running(self):
+        self.status = "running"
+        # A job handed to the OCR queue keeps the start of its first run
+        self.started_at = self.started_at or timezone.now()
+        self.save(update_fields=["status", "started_at", "last_updated"])
+
+    def mark_pending(self):
+        self.status = "pending"
+        self.current_stage = ""
+        self.save()
+
+    def mark_succeeded(self):
+        self.status = "succeeded"
+        self.current_stage = ""
+        self.finished_at = timezone.now()
+        self.save()
+
+    def mark_failed(self, error):
+        self.status = "failed"
+        self.error = str(error)
+        self.finished_at = timezone.now()
+        self.save()
+
+    @contextmanager
+    def track_stage(self, stage):
+        """
+        Record the status and wall-clock time of one pipeline stage.
+        """
+        self.current_stage = stage
+        self.stages[stage] = {"status": "running", "seconds": None}
+        self.save(update_fields=["current_stage", "stages", "last_updated"])
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.stages[stage] = {
+                "status": "failed",
+                "seconds": round(time.perf_counter() - start, 3),
+            }
+            raise
+        self.stages[stage] = {
+            "status": "succeeded",
+            "seconds": round(time.perf_counter() - start, 3),
+        }
+        self.save(
+            update_fields=[
+                "stages",
+                "page_count",
+                "chunk_count",
+                "last_updated",
+            ]
+        )
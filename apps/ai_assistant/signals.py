@@ -1,30 +1,89 @@
 import logging
-import os
 
-from django.db.models.signals import post_save
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from apps.properties.models import Document
+from apps.properties.models import Document, Property
 
-from .ai_functions.helper_function import process_property_document
-from .ai_functions.pdf_extractor import extract_text_from_pdf
+from .ai_functions.fact_sheet import invalidate_fact_sheet
+from .ai_functions.ingestion import ingestion_key
+from .ai_functions.listing_search import bump_listing_index_version
+from .ai_functions.retrieval import bump_retrieval_version
+from .models import DocumentIngestionJob
+from .tasks import embed_property_listing, ingest_document, refresh_property_fact_sheet
 
 logger = logging.getLogger(__name__)
 
+# Property fields that make up the text listing search embeds
+LISTING_TEXT_FIELDS = {"title", "description", "bedrooms", "property_type"}
+
+
+@receiver(pre_save, sender=Document)
+def detect_document_file_replacement(sender, instance, **kwargs):
+    """
+    Flag updates that replace the uploaded file so its chunks get re-embedded.
+    """
+    instance._file_replaced = False
+    if instance.pk:
+        previous_file = (
+            Document.objects.filter(pk=instance.pk)
+            .values_list("file", flat=True)
+            .first()
+        )
+        instance._file_replaced = previous_file != instance.file.name
+        if instance._file_replaced:
+            # Stored text and chunks of the old file no longer apply
+            instance.content_hash = ""
+
 
 @receiver(post_save, sender=Document)
 def handle_property_document_post_save(sender, instance, created, **kwargs):
-    if created:
-        try:
-            file_path = instance.file.path
-            if not os.path.exists(file_path):
-                logger.error(f"File not found: {file_path}")
-                return
-            document_text = extract_text_from_pdf(file_path)
-
-            if not document_text.strip():
-                logger.warning("No valid text extracted from the document")
-            process_property_document(instance, document_text)
-            logger.info("Property document processed sucessfully")
-        except Exception as e:
-            logger.error(f"Error processing property document: {e}", exc_info=True)
+    """
+    Record an ingestion job for a new or replaced document and process it in the
+    background once the upload transaction has committed. A version of the
+    file that already has a job is not queued again.
+    """
+    if created or getattr(instance, "_file_replaced", False):
+        invalidate_fact_sheet(instance.property_id)
+        job, queued = DocumentIngestionJob.objects.get_or_create(
+            idempotency_key=ingestion_key(instance), defaults={"document": instance}
+        )
+        if queued:
+            transaction.on_commit(lambda: ingest_document.delay(job.id))
+            logger.info(f"Queued ingestion job {job.id} for document {instance.id}")
+
+
+@receiver(post_save, sender=Property)
+def handle_property_post_save(sender, instance, update_fields=None, **kwargs):
+    """
+    Re-embed the listing text in the background; unchanged text is skipped there.
+    """
+    if update_fields and not LISTING_TEXT_FIELDS.intersection(update_fields):
+        return
+    transaction.on_commit(lambda: embed_property_listing.delay(instance.id))
+
+
+@receiver(post_save, sender=Property)
+def handle_property_soft_delete(sender, instance, update_fields=None, **kwargs):
+    """
+    Have every process drop the deleted listing from its listing search index.
+    """
+    if update_fields and "deleted_at" in update_fields:
+        transaction.on_commit(bump_listing_index_version)
+
+
+@receiver(post_delete, sender=Document)
+def handle_property_document_post_delete(sender, instance, **kwargs):
+    """
+    The document's chunks are removed by cascade; stop serving them from cache
+    and rebuild the fact sheet from the remaining documents.
+    """
+    transaction.on_commit(lambda: bump_retrieval_version(instance.property_id))
+    invalidate_fact_sheet(instance.property_id)
+    transaction.on_commit(
+        lambda: refresh_property_fact_sheet.apply_async(
+            (instance.property_id,), countdown=settings.FACT_SHEET_REFRESH_DELAY
+        )
+    )
@@ -0,0 +1,116 @@
+import logging
+
+from celery import shared_task
+from django.conf import settings
+
+from apps.properties.models import Property
+
+from .ai_functions.fact_sheet import refresh_fact_sheet
+from .ai_functions.generations import backfill_generation
+from .ai_functions.ingestion import document_lock, run_ingestion
+from .ai_functions.listing_search import embed_listings
+from .models import DocumentIngestionJob, EmbeddingGeneration
+
+logger = logging.getLogger(__name__)
+
+
+def _get_job(job_id):
+    try:
+        return DocumentIngestionJob.objects.select_related("document__property").get(
+            pk=job_id
+        )
+    except DocumentIngestionJob.DoesNotExist:
+        logger.error(f"Ingestion job {job_id} does not exist.")
+        return None
+
+
+def _schedule_fact_sheet(job):
+    if job.status == "succeeded":
+        # Delayed so documents uploaded together produce a single refresh
+        refresh_property_fact_sheet.apply_async(
+            (job.document.property_id,), countdown=settings.FACT_SHEET_REFRESH_DELAY
+        )
+
+
+def _is_runnable(job):
+    if job.status in ("succeeded", "failed"):
+        # A retried or redelivered task for a job that already ran
+        logger.info(f"Ingestion job {job.id} is already {job.status}.")
+        return False
+    if (
+        DocumentIngestionJob.objects.filter(document_id=job.document_id, pk__gt=job.pk)
+        .exclude(idempotency_key="")
+        .exists()
+    ):
+        job.mark_failed("Superseded by a newer upload of this document.")
+        return False
+    return True
+
+
+def _ingest_exclusively(task, job_id, **kwargs):
+    """
+    Run a pending job while holding its document's lock, so each version of a
+    document is processed once however often the task is delivered.
+    Returns the job, or None when there was nothing to run.
+    """
+    job = _get_job(job_id)
+    if not job or not _is_runnable(job):
+        return None
+    with document_lock(job.document_id) as acquired:
+        if not acquired:
+            # Another worker is on this document; try again once it is done
+            raise task.retry(countdown=settings.INGESTION_LOCK_RETRY_DELAY)
+        # Re-read under the lock: the previous holder may have run this job
+        job = _get_job(job_id)
+        if not job or not _is_runnable(job):
+            return None
+        return run_ingestion(job, **kwargs)
+
+
+@shared_task(bind=True, max_retries=None)
+def ingest_document(self, job_id):
+    handed_off = []
+    job = _ingest_exclusively(self, job_id, on_heavy=handed_off.append)
+    # Queued once the lock is released, so the OCR worker can take it at once
+    for heavy_job in handed_off:
+        ingest_heavy_document.delay(heavy_job.id)
+    if job:
+        _schedule_fact_sheet(job)
+
+
+@shared_task(bind=True, max_retries=None)
+def ingest_heavy_document(self, job_id):
+    """
+    Routed to the dedicated OCR queue by CELERY_TASK_ROUTES.
+    """
+    job = _ingest_exclusively(self, job_id)
+    if job:
+        _schedule_fact_sheet(job)
+
+
+@shared_task
+def refresh_property_fact_sheet(property_id):
+    try:
+        refresh_fact_sheet(property_id)
+    except Property.DoesNotExist:
+        logger.info(f"Property {property_id} was deleted before its fact sheet.")
+
+
+@shared_task
+def embed_property_listing(property_id):
+    property_instance = Property.objects.filter(pk=property_id).first()
+    if property_instance:
+        embed_listings([property_instance])
+
+
+@shared_task
+def backfill_embedding_generation(generation_id):
+    try:
+        generation = EmbeddingGeneration.objects.get(
+            pk=generation_id, status="backfilling"
+        )
+    except EmbeddingGeneration.DoesNotExist:
+        logger.error(f"No backfilling embedding generation {generation_id}.")
+        return
+    written = backfill_generation(generation)
+    logger.info(f"Backfilled {written} chunks into {generation}")
@@ -1,12 +1,21 @@
 from rest_framework import serializers
 
-from ..models import PropertyChatHistory, PropertyEmbedding
+from ..models import DocumentIngestionJob, PropertyChatHistory, PropertyEmbedding
 
 
 class PropertyEmbeddingSerializer(serializers.ModelSerializer):
     class Meta:
         model = PropertyEmbedding
-        fields = ["id", "property", "chunk", "embedding", "created_at"]
+        fields = [
+            "id",
+            "property",
+            "document",
+            "page_start",
+            "page_end",
+            "chunk",
+            "embedding",
+            "created_at",
+        ]
 
 
 class PropertyChatHistorySerializer(serializers.ModelSerializer):
@@ -17,3 +26,28 @@ class PropertyChatHistorySerializer(serializers.ModelSerializer):
 
 class PropertyChatSerializer(serializers.Serializer):
     question = serializers.CharField(max_length=400)
+
+
+class DocumentIngestionJobSerializer(serializers.ModelSerializer):
+    chat_ready = serializers.BooleanField(read_only=True)
+    duration = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = DocumentIngestionJob
+        fields = [
+            "id",
+            "document",
+            "status",
+            "current_stage",
+            "stages",
+            "page_count",
+            "chunk_count",
+            "extraction_plan",
+            "estimated_seconds",
+            "error",
+            "chat_ready",
+            "duration",
+            "started_at",
+            "finished_at",
+            "created_at",
+        ]
@@ -1,6 +1,6 @@
 from django.urls import path
 
-from .views import PropertyChatAPIView
+from .views import DocumentIngestionStatusAPIView, PropertyChatAPIView
 
 urlpatterns = [
     path(
@@ -8,4 +8,9 @@ urlpatterns = [
         PropertyChatAPIView.as_view(),
         name="property-chat",
     ),
+    path(
+        "api/documents/<int:document_id>/ingestion/",
+        DocumentIngestionStatusAPIView.as_view(),
+        name="document-ingestion-status",
+    ),
 ]
@@ -1,14 +1,20 @@
 import logging
 
-import numpy as np
-import openai
+from django.conf import settings
 from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 
+from apps.accounts.permission import IsAgent
 from services import CustomResponseMixin
 
-from ..models import PropertyChatHistory, PropertyEmbedding
-from .serializers import PropertyChatSerializer
+from ..ai_functions.chat_service import generate_chat_completion
+from ..ai_functions.embedding_service import generate_embeddling
+from ..ai_functions.fact_sheet import get_fact_sheet
+from ..ai_functions.generations import get_active_generation
+from ..ai_functions.retrieval import get_property_chunks, top_chunks
+from ..models import DocumentIngestionJob, PropertyChatHistory
+from .serializers import DocumentIngestionJobSerializer, PropertyChatSerializer
 
 logger = logging.getLogger(__name__)
 
@@ -18,30 +24,28 @@ class PropertyChatAPIView(APIView, CustomResponseMixin):
         serializer = PropertyChatSerializer(data=request.data)
         if serializer.is_valid():
             question = serializer.validated_data["question"]
-            # This Fetch embeddings for this property
-            embeddings_qs = PropertyEmbedding.objects.filter(property_id=property_id)
-            if not embeddings_qs.exists():
-                return self.custom_response(
-                    message="No data available for this property.",
-                    status=status.HTTP_404_NOT_FOUND,
-                )
+            fact_sheet = get_fact_sheet(property_id)
+            if fact_sheet and fact_sheet["token_count"] <= settings.CHAT_CONTEXT_TOKENS:
+                # Small document sets are answered from the precomputed fact
+                # sheet, with no question embedding or chunk scan
+                context = fact_sheet["content"]
+            else:
+                # This Fetch embeddings for this property (cached per retrieval version)
+                chunks, matrix = get_property_chunks(property_id)
+                if not chunks:
+                    return self.custom_response(
+                        message="No data available for this property.",
+                        status=status.HTTP_404_NOT_FOUND,
+                    )
 
-            question_embedding = self.generate_embedding(question)
-            if not question_embedding:
-                return self.custom_response(
-                    message="Failed to generate question embedding.",
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                )
-            # Calculate similarity with each chunk
-            chunks_with_scores = []
-            for emb in embeddings_qs:
-                score = self.cosine_similarity(question_embedding, emb.embedding)
-                chunks_with_scores.append((score, emb.chunk))
-            # Sort and select top 3 relevant chunks
-            top_chunks = sorted(chunks_with_scores, key=lambda x: x[0], reverse=True)[
-                :3
-            ]
-            context = "\n".join([chunk for _, chunk in top_chunks])
+                question_embedding = self.generate_embedding(question)
+                if not question_embedding:
+                    return self.custom_response(
+                        message="Failed to generate question embedding.",
+                        status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    )
+                # Select top 3 relevant chunks
+                context = "\n".join(top_chunks(chunks, matrix, question_embedding))
 
             # Fetch recent chat history for this property (limit last 5)
             chat_history_qs = PropertyChatHistory.objects.filter(
@@ -72,37 +76,47 @@ class PropertyChatAPIView(APIView, CustomResponseMixin):
                 data=serializer.errors, status=status.HTTP_400_BAD_REQUEST
             )
 
-    def generate_embedding(self, text, model="text-embedding-ada-002"):
-        try:
-            response = openai.embeddings.create()(input=text, model=model)
-            return response["data"][0]["embedding"]
-        except Exception as e:
-            logger.error(f"Embedding error: {e}")
-            return None
+    def generate_embedding(self, text):
+        # The question must live in the same vector space as the stored chunks
+        generation = get_active_generation()
+        return generate_embeddling(
+            text, model=generation.model_name, dimensions=generation.dimensions
+        )
 
-    def cosine_similarity(self, vec1, vec2):
-        # Simple cosine similarity between two lists
-        vec1 = np.array(vec1)
-        vec2 = np.array(vec2)
-        dot_product = np.dot(vec1, vec2)
-        norm1 = np.linalg.norm(vec1)
-        norm2 = np.linalg.norm(vec2)
-        return dot_product / (norm1 * norm2)
+    def call_openai_chat(self, prompt, model=None, temperature=0.2):
+        answer = generate_chat_completion(
+            [
+                {
+                    "role": "system",
+                    "content": "You are a helpful real estate assistant.",
+                },
+                {"role": "user", "content": prompt},
+            ],
+            model=model,
+            temperature=temperature,
+        )
+        return answer or "Sorry, I couldn't process your question at the moment."
 
-    def call_openai_chat(self, prompt, model="gpt-3.5-turbo", temperature=0.2):
-        try:
-            response = openai.ChatCompletion.create(
-                model=model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a helpful real estate assistant.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=temperature,
+
+class DocumentIngestionStatusAPIView(APIView, CustomResponseMixin):
+    """
+    Lets an agent poll the latest ingestion job of one of their documents.
+    """
+
+    permission_classes = [IsAuthenticated, IsAgent]
+
+    def get(self, request, document_id):
+        jobs = DocumentIngestionJob.objects.filter(document_id=document_id)
+        if not request.user.is_superuser:
+            jobs = jobs.filter(document__property__assigned_agent=request.user)
+        job = jobs.order_by("-created_at").first()
+        if not job:
+            return self.custom_response(
+                message="No ingestion job found for this document.",
+                status=status.HTTP_404_NOT_FOUND,
             )
-            return response["choices"][0]["message"]["content"].strip()
-        except Exception as e:
-            print(f"ChatCompletion error: {e}")
-            return "Sorry, I couldn't process your question at the moment."
+        return self.custom_response(
+            message="Ingestion status fetched successfully",
+            data=DocumentIngestionJobSerializer(job).data,
+            status=status.HTTP_200_OK,
+        )
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ClientAppConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.properties"
+
+    def ready(self):
+        import apps.properties.signals
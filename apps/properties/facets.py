@@ -0,0 +1,64 @@
+from django.db.models import Count, Q
+
+from services import PROPERTY_STATUS_CHOICES, PROPERTY_TYPES
+
+# (label, lowest price, price the bucket stops below); None is unbounded
+PRICE_BUCKETS = [
+    ("under_100k", None, 100000),
+    ("100k_250k", 100000, 250000),
+    ("250k_500k", 250000, 500000),
+    ("500k_1m", 500000, 1000000),
+    ("1m_plus", 1000000, None),
+]
+# Bedroom counts below this are facet values of their own, the rest share one
+MAX_BEDROOM_FACET = 5
+# Facet value of listings without a bedroom count, e.g. land
+UNKNOWN_BEDROOMS = "unknown"
+
+
+def _price_condition(low, high):
+    condition = Q()
+    if low is not None:
+        condition &= Q(price__gte=low)
+    if high is not None:
+        condition &= Q(price__lt=high)
+    return condition
+
+
+def facet_conditions():
+    """The condition each facet value counts listings by, per facet"""
+    return {
+        "property_type": {value: Q(property_type=value) for value, _ in PROPERTY_TYPES},
+        "status": {value: Q(status=value) for value, _ in PROPERTY_STATUS_CHOICES},
+        "listing": {"for_sale": Q(for_sale=True), "for_rent": Q(for_rent=True)},
+        "bedrooms": {
+            **{str(count): Q(bedrooms=count) for count in range(MAX_BEDROOM_FACET)},
+            f"{MAX_BEDROOM_FACET}+": Q(bedrooms__gte=MAX_BEDROOM_FACET),
+            UNKNOWN_BEDROOMS: Q(bedrooms__isnull=True),
+        },
+        "price": {
+            label: _price_condition(low, high) for label, low, high in PRICE_BUCKETS
+        },
+    }
+
+
+def facet_counts(queryset):
+    """
+    The listings in `queryset` in total and with each facet value, counted in
+    a single pass: one query with a filtered COUNT per value.
+    """
+    facets = facet_conditions()
+    aggregates = {"total": Count("pk")}
+    for facet, values in facets.items():
+        for index, condition in enumerate(values.values()):
+            aggregates[f"{facet}_{index}"] = Count("pk", filter=condition)
+    counts = queryset.aggregate(**aggregates)
+    return {
+        "total": counts["total"],
+        **{
+            facet: {
+                value: counts[f"{facet}_{index}"] for index, value in enumerate(values)
+            }
+            for facet, values in facets.items()
+        },
+    }
@@ -1,21 +1,20 @@
 import django_filters
+from django.contrib.postgres.search import SearchHeadline, SearchRank
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+from rest_framework.filters import SearchFilter
 
 from .models import Property
+from .search import SEARCH_CONFIG, SNIPPET_OPTIONS, prefix_query
 
 
 class PropertyFilter(django_filters.FilterSet):
     price_min = django_filters.NumberFilter(field_name="price", lookup_expr="gte")
     price_max = django_filters.NumberFilter(field_name="price", lookup_expr="lte")
-    city = django_filters.CharFilter(field_name="location__city")
-    state = django_filters.CharFilter(field_name="location__state")
-    country = django_filters.CharFilter(field_name="location__country")
     bedrooms_min = django_filters.NumberFilter(field_name="bedrooms", lookup_expr="gte")
     bathrooms_min = django_filters.NumberFilter(
         field_name="bathrooms", lookup_expr="gte"
     )
-    bathrooms_min = django_filters.NumberFilter(
-        field_name="bathrooms", lookup_expr="gte"
-    )
     square_feet_min = django_filters.NumberFilter(
         field_name="square_feet", lookup_expr="gte"
     )
@@ -28,3 +27,29 @@ class PropertyFilter(django_filters.FilterSet):
             "for_sale": ["exact"],
             "for_rent": ["exact"],
         }
+
+
+class PropertySearchFilter(SearchFilter):
+    """
+    Full-text search on `?search=` over the indexed `search_vector`, best
+    matches first. Each result carries its `search_rank` and a
+    `search_snippet` of the description with the matches highlighted.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        query = prefix_query(request.query_params.get(self.search_param, ""))
+        if query is None:
+            return queryset
+        return (
+            queryset.filter(search_vector=query)
+            .annotate(
+                # As double precision, so the rank a pagination cursor carries
+                # compares equal to the rank it came from
+                search_rank=Cast(SearchRank(F("search_vector"), query), FloatField()),
+                # Postgres only builds snippets for the rows of the page
+                search_snippet=SearchHeadline(
+                    "description", query, config=SEARCH_CONFIG, **SNIPPET_OPTIONS
+                ),
+            )
+            .order_by("-search_rank", "-id")
+        )
@@ -0,0 +1,97 @@
+import math
+
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_PRECISION = 12
+EARTH_RADIUS_KM = 6371.0088
+# Upper bound on the cells a nearby query is expanded into
+MAX_COVERING_CELLS = 16
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    """
+    Geohash of a point. Points in the same cell share a prefix, so a cell is
+    found with a prefix match on an ordinary B-tree index.
+    """
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    latitude, longitude = float(latitude), float(longitude)
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        # Bits alternate between longitude and latitude, longitude first
+        interval, coordinate = (lng_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(GEOHASH_ALPHABET[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+
+def _cell_size(precision):
+    """
+    Height and width in degrees of a geohash cell.
+    """
+    lng_bits = math.ceil(precision * 5 / 2)
+    lat_bits = precision * 5 - lng_bits
+    return 180.0 / 2**lat_bits, 360.0 / 2**lng_bits
+
+
+def covering_cells(latitude, longitude, radius_km):
+    """
+    The geohash prefixes whose cells together cover the circle's bounding box,
+    at the finest precision that needs no more than MAX_COVERING_CELLS of them.
+    """
+    lat_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+    south, north = max(latitude - lat_delta, -90.0), min(latitude + lat_delta, 90.0)
+    # Longitude degrees shrink towards the poles; near one, take every longitude
+    widest = max(abs(south), abs(north))
+    if widest >= 89.9:
+        west, east = -180.0, 180.0
+    else:
+        lng_delta = lat_delta / math.cos(math.radians(widest))
+        west, east = longitude - lng_delta, longitude + lng_delta
+        if east - west >= 360:
+            west, east = -180.0, 180.0
+
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = _cell_size(precision)
+        rows = range(
+            math.floor((south + 90) / height),
+            min(math.floor((north + 90) / height), round(180 / height) - 1) + 1,
+        )
+        columns = range(
+            math.floor((west + 180) / width), math.floor((east + 180) / width) + 1
+        )
+        if len(rows) * len(columns) <= MAX_COVERING_CELLS or precision == 1:
+            break
+
+    cells = set()
+    columns_per_turn = round(360 / width)
+    for row in rows:
+        for column in columns:
+            # Wrap columns that cross the antimeridian
+            column %= columns_per_turn
+            cells.add(
+                encode_geohash(
+                    (row + 0.5) * height - 90, (column + 0.5) * width - 180, precision
+                )
+            )
+    return sorted(cells)
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """
+    Great-circle distance between two points in kilometres.
+    """
+    lat1, lng1, lat2, lng2 = map(math.radians, map(float, (lat1, lng1, lat2, lng2)))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
@@ -0,0 +1,149 @@
+import json
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.properties.filters import PropertyFilter
+from apps.properties.models import Property
+from apps.properties.search import prefix_query
+from services import PROPERTY_TYPES, KeysetPagination
+
+
+def _seed(rows):
+    """
+    Insert `rows` listings spread like production data: mostly available,
+    every type, a year of creation dates and a few awaiting purge.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {Property._meta.db_table} (
+                created_at, last_updated, title, price, property_type, status,
+                for_sale, for_rent, description, deleted_at
+            )
+            SELECT
+                now() - random() * interval '365 days',
+                now(),
+                'Plan check listing ' || n,
+                round((10000 + random() * 5000000)::numeric, 2),
+                (%s::text[])[1 + floor(random() * %s)::int],
+                CASE WHEN random() < 0.8 THEN 'available'
+                     WHEN random() < 0.5 THEN 'sold'
+                     ELSE 'under_negotiation' END,
+                random() < 0.6,
+                random() < 0.4,
+                CASE WHEN random() < 0.05 THEN 'Quiet street with a large garden'
+                     ELSE 'Close to shops and schools' END,
+                CASE WHEN random() < 0.01 THEN now() END
+            FROM generate_series(1, %s) AS n
+            """,
+            [[value for value, _ in PROPERTY_TYPES], len(PROPERTY_TYPES), rows],
+        )
+        cursor.execute(f"ANALYZE {Property._meta.db_table}")
+
+
+def _filtered(params):
+    return PropertyFilter(params, queryset=Property.objects.all()).qs
+
+
+def _after(ordering, values):
+    """
+    The seek condition KeysetPagination puts on every page after the first.
+    """
+    pagination = KeysetPagination()
+    pagination.ordering = ordering
+    return pagination.after(values)
+
+
+def key_queries():
+    """
+    The listing queries every plan is checked for, by name. Page-sized, as the
+    API runs them.
+    """
+    page = KeysetPagination.page_size + 1
+    newest, by_price = ("-created_at", "-id"), ("price", "id")
+    now = timezone.now()
+    return {
+        "list newest": Property.objects.order_by(*newest)[:page],
+        "list newest, later page": Property.objects.filter(
+            _after(newest, [now - timedelta(days=200), 1])
+        ).order_by(*newest)[:page],
+        "list by price, later page": Property.objects.filter(
+            _after(by_price, ["2500000", 1])
+        ).order_by(*by_price)[:page],
+        "price range": _filtered(
+            {"price_min": "100000", "price_max": "150000"}
+        ).order_by(*by_price)[:page],
+        "available of a type by price": _filtered(
+            {
+                "status": "available",
+                "property_type": "house",
+                "price_min": "100000",
+                "price_max": "900000",
+            }
+        ).order_by(*by_price)[:page],
+        "for sale by price": _filtered({"for_sale": "true"}).order_by(*by_price)[:page],
+        "for rent by price": _filtered({"for_rent": "true"}).order_by(*by_price)[:page],
+        "sold, newest": _filtered({"status": "sold"}).order_by(*newest)[:page],
+        "new listings": Property.objects.filter(
+            created_at__gte=now - timedelta(days=7)
+        ).order_by(*newest),
+        "full-text search": Property.objects.filter(
+            search_vector=prefix_query("garden")
+        ),
+    }
+
+
+def _walk(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _walk(child)
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN the key listing queries against a seeded dataset and fail if "
+        "any plan reads the property table with a sequential scan. The seed "
+        "rows are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100000, help="Listings to seed")
+        parser.add_argument(
+            "--plans", action="store_true", help="Print every plan in full"
+        )
+
+    def handle(self, *args, **options):
+        table = Property._meta.db_table
+        regressions = []
+        with transaction.atomic():
+            _seed(options["rows"])
+            self.stdout.write(f"Seeded {options['rows']} listings\n")
+            for name, queryset in key_queries().items():
+                plan = json.loads(queryset.explain(format="json"))[0]["Plan"]
+                nodes = list(_walk(plan))
+                seq_scan = any(
+                    node["Node Type"] == "Seq Scan"
+                    and node.get("Relation Name") == table
+                    for node in nodes
+                )
+                indexes = sorted(
+                    {node["Index Name"] for node in nodes if "Index Name" in node}
+                )
+                if seq_scan:
+                    regressions.append(name)
+                    self.stdout.write(self.style.ERROR(f"{name:30} sequential scan"))
+                else:
+                    self.stdout.write(f"{name:30} {', '.join(indexes)}")
+                if seq_scan or options["plans"]:
+                    self.stdout.write(queryset.explain())
+            transaction.set_rollback(True)
+
+        if regressions:
+            raise CommandError(
+                f"{len(regressions)} of the key queries scan {table} sequentially: "
+                f"{', '.join(regressions)}"
+            )
+        self.stdout.write(self.style.SUCCESS("Every key query uses an index"))
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-19 15:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("properties", "0003_document_content_hash"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="property",
+            name="deleted_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
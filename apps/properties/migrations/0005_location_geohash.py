@@ -0,0 +1,44 @@
+# Generated by Django 5.1.7 on 2026-10-19 15:12
+
+from django.db import migrations, models
+
+from apps.properties.geo import encode_geohash
+
+
+def backfill_geohash(apps, schema_editor):
+    PropertyLocation = apps.get_model("properties", "PropertyLocation")
+    locations = PropertyLocation.objects.filter(
+        latitude__isnull=False, longitude__isnull=False
+    ).only("latitude", "longitude")
+    batch = []
+    for location in locations.iterator(chunk_size=2000):
+        location.geohash = encode_geohash(location.latitude, location.longitude)
+        batch.append(location)
+        if len(batch) == 2000:
+            PropertyLocation.objects.bulk_update(batch, ["geohash"])
+            batch = []
+    PropertyLocation.objects.bulk_update(batch, ["geohash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("properties", "0004_property_deleted_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="propertylocation",
+            name="geohash",
+            field=models.CharField(blank=True, max_length=12),
+        ),
+        migrations.AddIndex(
+            model_name="propertylocation",
+            index=models.Index(
+                fields=["geohash"],
+                name="location_geohash_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ),
+        migrations.RunPython(backfill_geohash, migrations.RunPython.noop),
+    ]
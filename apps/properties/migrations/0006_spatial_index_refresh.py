@@ -0,0 +1,30 @@
+# Generated by Django 5.1.7 on 2026-10-19 15:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("properties", "0005_location_geohash"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="propertylocation",
+            name="last_updated",
+            field=models.DateTimeField(
+                auto_now=True, db_index=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", False)),
+                fields=["deleted_at"],
+                name="property_deleted_at_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.1.7 on 2026-10-19 15:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("properties", "0008_keyset_pagination_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(
+                condition=models.Q(
+                    ("deleted_at__isnull", True), ("status", "available")
+                ),
+                fields=["property_type", "price", "id"],
+                name="property_available_type_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["status", "created_at", "id"],
+                name="property_status_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True), ("for_sale", True)),
+                fields=["price", "id"],
+                name="property_for_sale_price_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True), ("for_rent", True)),
+                fields=["price", "id"],
+                name="property_for_rent_price_idx",
+            ),
+        ),
+    ]
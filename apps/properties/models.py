@@ -1,11 +1,17 @@
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.urls import reverse
+from django.utils import timezone
 
 from apps.accounts.models import Audit
 from services import DOCUMENT_TYPE_CHOICES, PROPERTY_STATUS_CHOICES, PROPERTY_TYPES
 
+from .geo import GEOHASH_PRECISION, encode_geohash
+from .search import listing_search_vector
+
 
 def upload_property_documents(instance, filename):
     return f"properties/{instance.property.id}/documents/{filename}"
@@ -20,6 +26,8 @@ class Document(Audit):
         choices=DOCUMENT_TYPE_CHOICES,
     )
     file = models.FileField(upload_to=upload_property_documents, blank=True, null=True)
+    # SHA-256 of the file, set at ingestion so identical uploads reuse embeddings
+    content_hash = models.CharField(max_length=64, blank=True, db_index=True)
 
     def __str__(self):
         return f"{self.document_type} for {self.property.title}"
@@ -27,6 +35,13 @@ class Document(Audit):
 
 
 
+class LivePropertyManager(models.Manager):
+    """Leaves out properties that are deleted and waiting to be purged"""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
 class Property(Audit):
     assigned_agent = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -47,10 +62,70 @@ class Property(Audit):
     )
     for_sale = models.BooleanField(default=False)
     for_rent = models.BooleanField(default=False)
+    # Set on delete; rows and files are purged later by a background task
+    deleted_at = models.DateTimeField(blank=True, null=True)
+    # Kept up to date by Postgres from the title and description
+    search_vector = models.GeneratedField(
+        expression=listing_search_vector(),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    objects = LivePropertyManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            # Only the few deleted rows are indexed
+            models.Index(
+                fields=["deleted_at"],
+                name="property_deleted_at_idx",
+                condition=models.Q(deleted_at__isnull=False),
+            ),
+            GinIndex(fields=["search_vector"], name="property_search_vector_idx"),
+            # Keyset pagination of live listings, newest first or by price
+            models.Index(
+                fields=["created_at", "id"],
+                name="property_created_at_id_idx",
+                condition=models.Q(deleted_at__isnull=True),
+            ),
+            models.Index(
+                fields=["price", "id"],
+                name="property_price_id_idx",
+                condition=models.Q(deleted_at__isnull=True),
+            ),
+            # List filters, each ending in a keyset ordering. Checked by the
+            # check_query_plans command
+            models.Index(
+                fields=["property_type", "price", "id"],
+                name="property_available_type_idx",
+                condition=models.Q(status="available", deleted_at__isnull=True),
+            ),
+            models.Index(
+                fields=["status", "created_at", "id"],
+                name="property_status_created_idx",
+                condition=models.Q(deleted_at__isnull=True),
+            ),
+            models.Index(
+                fields=["price", "id"],
+                name="property_for_sale_price_idx",
+                condition=models.Q(for_sale=True, deleted_at__isnull=True),
+            ),
+            models.Index(
+                fields=["price", "id"],
+                name="property_for_rent_price_idx",
+                condition=models.Q(for_rent=True, deleted_at__isnull=True),
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
+    def soft_delete(self):
+        """Hide the property from every listing and lookup straight away"""
+        self.deleted_at = timezone.now()
+        self.save(update_fields=["deleted_at", "last_updated"])
+
     def is_visible(self):
         """Checks if the agent has an active subscription"""
         # Assuming there's an 'agent' attribute related to this property
@@ -67,6 +142,8 @@ class Property(Audit):
 class PropertyImage(models.Model):
     property = models.ForeignKey(Property, related_name='property_image', on_delete=models.CASCADE )
     image = models.ImageField(upload_to="property_images/", blank=True, null=True)
+    # Validator for conditional GETs of the image endpoints
+    last_updated = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"Image for{self.property.title}"
@@ -74,6 +151,8 @@ class PropertyImage(models.Model):
 class PropertyVideo(models.Model):
     property = models.ForeignKey(Property, related_name='property_video', on_delete=models.CASCADE)
     image = models.ImageField(upload_to="property_videos/", blank=True, null=True)
+    # Validator for conditional GETs of the video endpoints
+    last_updated = models.DateTimeField(auto_now=True)
     def __str__(self):
         return f"Video for{self.property.title}"
     
@@ -92,4 +171,26 @@ class PropertyLocation(models.Model):
         blank=True,
         null=True,
         validators=[MinValueValidator(-180.0), MaxValueValidator(180.0)],
-    )
\ No newline at end of file
+    )
+    # Geohash of the coordinates; nearby search prefix-matches it
+    geohash = models.CharField(max_length=GEOHASH_PRECISION, blank=True)
+    # Lets the in-memory spatial index load only the rows changed since its
+    # last refresh
+    last_updated = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            # pattern_ops so LIKE 'prefix%' can use the B-tree under any collation
+            models.Index(
+                fields=["geohash"],
+                name="location_geohash_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.latitude is not None and self.longitude is not None:
+            self.geohash = encode_geohash(self.latitude, self.longitude)
+        else:
+            self.geohash = ""
+        super().save(*args, **kwargs)
@@ -0,0 +1,153 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from types import SimpleNamespace
+
+import numpy as np
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.utils.urls import replace_query_param
+
+from services import KeysetPagination
+
+from .models import Property
+
+NEW_LISTINGS_DAYS = 7
+NEW_LISTINGS_VERSION_KEY = "new_listings_version"
+# Rows are re-read with this overlap so a save committed late is never missed
+REFRESH_OVERLAP = timedelta(minutes=1)
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+
+
+def bump_new_listings_version():
+    cache.set(NEW_LISTINGS_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def _microseconds(moment):
+    # Exact, unlike a float timestamp, so cursors land on the listing they name
+    return (moment - EPOCH) // MICROSECOND
+
+
+class NewListingsFeed:
+    """
+    Process-local IDs of recent listings in creation order. It is loaded once
+    and then refreshed with only the listings created, and deleted, since;
+    a page is a slice of it, so serving one never touches more than the page.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.version = None
+        self.loaded_at = None
+        # (created_at in microseconds, ids), ascending, replaced as one tuple
+        self.snapshot = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+
+    def refresh(self):
+        version = cache.get_or_set(NEW_LISTINGS_VERSION_KEY, time.time_ns, timeout=None)
+        if version == self.version:
+            return
+        with self._lock:
+            if version == self.version:
+                return
+            started = timezone.now()
+            window_start = started - timedelta(days=NEW_LISTINGS_DAYS)
+            created, ids = self.snapshot
+            if self.loaded_at:
+                since = self.loaded_at - REFRESH_OVERLAP
+                deleted = Property.all_objects.filter(
+                    deleted_at__gte=since
+                ).values_list("id", flat=True)
+                rows = Property.objects.filter(created_at__gte=since)
+                keep = ~np.isin(ids, np.fromiter(deleted, dtype=np.int64))
+                created, ids = created[keep], ids[keep]
+            else:
+                rows = Property.objects.filter(created_at__gte=window_start)
+            rows = list(rows.values_list("created_at", "id"))
+            if rows:
+                added = np.array([row[1] for row in rows], dtype=np.int64)
+                keep = ~np.isin(ids, added)
+                created = np.concatenate(
+                    [
+                        created[keep],
+                        np.array([_microseconds(row[0]) for row in rows], np.int64),
+                    ]
+                )
+                ids = np.concatenate([ids[keep], added])
+                order = np.lexsort((ids, created))
+                created, ids = created[order], ids[order]
+            # Listings that aged out of the window are dropped here and
+            # skipped by page() until then
+            start = np.searchsorted(created, _microseconds(window_start))
+            self.snapshot = (created[start:], ids[start:])
+            self.loaded_at = started
+            self.version = version
+
+    def page(self, after=None, limit=20):
+        """
+        IDs of up to `limit` listings, newest first, created in the window and
+        before the listing `after` = (created_at, id). Returns the IDs and the
+        (created_at, id) to continue after, or None on the last page.
+        """
+        created, ids = self.snapshot
+        oldest = np.searchsorted(
+            created,
+            _microseconds(timezone.now() - timedelta(days=NEW_LISTINGS_DAYS)),
+        )
+        end = len(ids)
+        if after is not None:
+            after_created, after_id = _microseconds(after[0]), after[1]
+            first = np.searchsorted(created, after_created, "left")
+            last = np.searchsorted(created, after_created, "right")
+            end = first + np.searchsorted(ids[first:last], after_id, "left")
+        start = max(end - limit, oldest)
+        if start <= oldest or start >= end:
+            return ids[start:end][::-1].tolist(), None
+        last = (EPOCH + int(created[start]) * MICROSECOND, int(ids[start]))
+        return ids[start:end][::-1].tolist(), last
+
+
+new_listings_feed = NewListingsFeed()
+
+
+class NewListingsPagination(KeysetPagination):
+    """
+    Pages of the new listings feed, with the same cursors as listings
+    paginated newest first.
+    """
+
+    def paginate_queryset(self, feed, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        self.ordering = ("-created_at", "-id")
+        position = self.decode_cursor(request)
+        if position is not None:
+            try:
+                created_at = parse_datetime(str(position[0]))
+            except ValueError:
+                created_at = None
+            if (
+                created_at is None
+                or timezone.is_naive(created_at)
+                or not isinstance(position[1], int)
+            ):
+                raise NotFound(self.invalid_cursor_message)
+            position = (created_at, position[1])
+        feed.refresh()
+        ids, self.last = feed.page(position, self.get_page_size(request))
+        self.has_next = self.last is not None
+        properties = Property.objects.in_bulk(ids)
+        # Listings deleted since the last refresh are left out
+        self.page = [properties[pk] for pk in ids if pk in properties]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        # From the feed, which still holds the last listing even if deleted
+        created_at, pk = self.last
+        row = SimpleNamespace(created_at=created_at, id=pk)
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, self.encode_cursor(row)
+        )
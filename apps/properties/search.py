@@ -0,0 +1,38 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchVector
+
+# Text search configuration listings are stemmed with, in the column and in queries
+SEARCH_CONFIG = "english"
+# Longest query, in terms, that is searched
+MAX_QUERY_TERMS = 16
+SNIPPET_OPTIONS = {
+    "start_sel": "<mark>",
+    "stop_sel": "</mark>",
+    "max_words": 35,
+    "min_words": 15,
+    "max_fragments": 2,
+}
+
+
+def listing_search_vector():
+    """
+    What a listing is searched by: the title, weighted above the description.
+    """
+    return SearchVector("title", weight="A", config=SEARCH_CONFIG) + SearchVector(
+        "description", weight="B", config=SEARCH_CONFIG
+    )
+
+
+def prefix_query(text):
+    """
+    A query matching listings that contain every term, the last one as a
+    prefix so results follow the user while they type; None if `text` has
+    no terms.
+    """
+    terms = re.findall(r"\w+", text.lower())[:MAX_QUERY_TERMS]
+    if not terms:
+        return None
+    # Only word characters reach the raw tsquery, so input cannot break its syntax
+    raw = " & ".join(terms[:-1] + [f"{terms[-1]}:*"])
+    return SearchQuery(raw, search_type="raw", config=SEARCH_CONFIG)
@@ -0,0 +1,88 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from services.list_cache import bump_generation
+
+from .models import Document, Property, PropertyImage, PropertyLocation, PropertyVideo
+from .new_listings import bump_new_listings_version
+from .spatial_index import bump_spatial_index_version
+
+# Generation of the cached property, image and location list responses
+PROPERTY_LIST_GENERATION_KEY = "property_list_generation"
+# Overview generations last as long as the overviews cached under them, so
+# the keys of properties nobody asks for, or that do not exist, expire
+PROPERTY_OVERVIEW_GENERATION_TIMEOUT = settings.LIST_CACHE_TIMEOUT
+
+
+def property_overview_generation_key(property_id):
+    """Generation of the cached overview of one property"""
+    return f"property_overview_generation:{property_id}"
+
+
+@receiver(post_save, sender=PropertyLocation)
+def handle_location_save(sender, instance, **kwargs):
+    """
+    Have every process refresh its spatial index once the change has committed.
+    """
+    transaction.on_commit(bump_spatial_index_version)
+
+
+@receiver(post_delete, sender=PropertyLocation)
+def handle_location_delete(sender, instance, **kwargs):
+    """
+    Deleted rows leave nothing for a refresh to find, so rebuild the index.
+    """
+    transaction.on_commit(lambda: bump_spatial_index_version(rebuild=True))
+
+
+@receiver(post_save, sender=Property)
+def handle_property_soft_delete(sender, instance, update_fields=None, **kwargs):
+    """
+    Drop the locations of a deleted property from the spatial index.
+    """
+    if update_fields and "deleted_at" in update_fields:
+        transaction.on_commit(bump_spatial_index_version)
+
+
+@receiver([post_save, post_delete], sender=Property)
+@receiver([post_save, post_delete], sender=PropertyImage)
+@receiver([post_save, post_delete], sender=PropertyLocation)
+def handle_listing_change(sender, **kwargs):
+    """
+    Stop serving cached list responses once the change has committed.
+    """
+    transaction.on_commit(lambda: bump_generation(PROPERTY_LIST_GENERATION_KEY))
+
+
+@receiver(post_save, sender=Property)
+def handle_listing_created_or_deleted(
+    sender, instance, created, update_fields=None, **kwargs
+):
+    """
+    Add new listings to, and drop deleted ones from, the new listings feed.
+    """
+    if created or (update_fields and "deleted_at" in update_fields):
+        transaction.on_commit(bump_new_listings_version)
+
+
+@receiver([post_save, post_delete], sender=Property)
+@receiver([post_save, post_delete], sender=PropertyImage)
+@receiver([post_save, post_delete], sender=PropertyVideo)
+@receiver([post_save, post_delete], sender=PropertyLocation)
+@receiver([post_save, post_delete], sender=Document)
+def handle_overview_change(sender, instance, signal, **kwargs):
+    """
+    Stop serving the cached overview of the property the change belongs to.
+    """
+    property_id = instance.pk if sender is Property else instance.property_id
+    key = property_overview_generation_key(property_id)
+    if sender is Property and signal is post_delete:
+        # Purged, so there is no overview left to cache
+        transaction.on_commit(lambda: cache.delete(key))
+    else:
+        transaction.on_commit(
+            lambda: bump_generation(key, PROPERTY_OVERVIEW_GENERATION_TIMEOUT)
+        )
@@ -0,0 +1,213 @@
+import threading
+import time
+from datetime import timedelta
+
+import numpy as np
+from django.core.cache import cache
+from django.db.models import FloatField
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from .geo import EARTH_RADIUS_KM
+from .models import PropertyLocation
+
+SPATIAL_INDEX_VERSION_KEY = "spatial_index_version"
+# Moved only when location rows are deleted, which a refresh cannot see
+SPATIAL_INDEX_EPOCH_KEY = "spatial_index_epoch"
+# Degrees per side of a grid cell; about 11 km at the equator
+GRID_DEGREES = 0.1
+GRID_ROWS = round(180 / GRID_DEGREES)
+GRID_COLUMNS = round(360 / GRID_DEGREES)
+# Rows are re-read with this overlap so a save committed late is never missed
+REFRESH_OVERLAP = timedelta(minutes=1)
+
+
+def bump_spatial_index_version(rebuild=False):
+    """
+    Have every process refresh its index on its next search; with `rebuild`,
+    reload it from scratch.
+    """
+    now = time.time_ns()
+    keys = [SPATIAL_INDEX_VERSION_KEY] + ([SPATIAL_INDEX_EPOCH_KEY] if rebuild else [])
+    cache.set_many({key: now for key in keys}, timeout=None)
+
+
+def _coordinate_rows(locations):
+    # Cast in the database; building Decimals for every row is the slow part
+    return locations.annotate(
+        lat=Cast("latitude", FloatField()), lng=Cast("longitude", FloatField())
+    ).values_list("id", "property_id", "lat", "lng", "property__deleted_at")
+
+
+def _grid_rows(latitudes):
+    return np.clip(
+        ((latitudes + 90) // GRID_DEGREES).astype(np.int64), 0, GRID_ROWS - 1
+    )
+
+
+def _grid_columns(longitudes):
+    return ((longitudes + 180) // GRID_DEGREES).astype(np.int64) % GRID_COLUMNS
+
+
+class Snapshot:
+    """
+    Coordinates of every live location, plus the same positions ordered by
+    grid cell so the points of a run of cells are one contiguous slice.
+    """
+
+    def __init__(self, location_ids, property_ids, latitudes, longitudes):
+        self.columns = location_ids, property_ids, latitudes, longitudes
+        self.location_ids = location_ids
+        self.property_ids = property_ids
+        self.radians = np.radians(latitudes), np.radians(longitudes)
+        cells = _grid_rows(latitudes) * GRID_COLUMNS + _grid_columns(longitudes)
+        self.order = np.argsort(cells, kind="stable")
+        self.cells = cells[self.order]
+
+    @classmethod
+    def from_rows(cls, rows):
+        return cls(
+            np.array([row[0] for row in rows], dtype=np.int64),
+            np.array([row[1] for row in rows], dtype=np.int64),
+            np.array([row[2] for row in rows], dtype=np.float64),
+            np.array([row[3] for row in rows], dtype=np.float64),
+        )
+
+
+class SpatialIndex:
+    """
+    Process-local index of property location coordinates. It is loaded once
+    and then refreshed with only the locations saved, and the properties
+    deleted, since; deleted locations make it reload.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.version = None
+        self.epoch = None
+        self.loaded_at = None
+        self.snapshot = Snapshot.from_rows([])
+
+    def refresh(self):
+        state = cache.get_many([SPATIAL_INDEX_VERSION_KEY, SPATIAL_INDEX_EPOCH_KEY])
+        version = state.get(SPATIAL_INDEX_VERSION_KEY)
+        epoch = state.get(SPATIAL_INDEX_EPOCH_KEY)
+        if self.loaded_at and (version, epoch) == (self.version, self.epoch):
+            return
+        with self._lock:
+            if self.loaded_at and (version, epoch) == (self.version, self.epoch):
+                return
+            started = timezone.now()
+            if self.loaded_at and epoch == self.epoch:
+                self.snapshot = self._apply_changes(self.loaded_at - REFRESH_OVERLAP)
+            else:
+                self.snapshot = Snapshot.from_rows(
+                    list(
+                        _coordinate_rows(
+                            PropertyLocation.objects.filter(
+                                property__deleted_at__isnull=True,
+                                latitude__isnull=False,
+                                longitude__isnull=False,
+                            )
+                        )
+                    )
+                )
+            self.loaded_at = started
+            self.version, self.epoch = version, epoch
+
+    def _apply_changes(self, since):
+        changed = {
+            row[0]: row
+            for locations in (
+                PropertyLocation.objects.filter(last_updated__gte=since),
+                PropertyLocation.objects.filter(property__deleted_at__gte=since),
+            )
+            for row in _coordinate_rows(locations)
+        }
+        if not changed:
+            return self.snapshot
+        # Changed rows replace their old entries; the rest are kept as they are
+        keep = ~np.isin(self.snapshot.location_ids, list(changed))
+        live = [
+            row
+            for row in changed.values()
+            if row[4] is None and row[2] is not None and row[3] is not None
+        ]
+        added = Snapshot.from_rows(live)
+        return Snapshot(
+            *(
+                np.concatenate([kept[keep], new])
+                for kept, new in zip(self.snapshot.columns, added.columns)
+            )
+        )
+
+    def _candidates(self, snapshot, latitude, longitude, radius_km):
+        """
+        Positions of the points in the grid cells covering the circle's
+        bounding box.
+        """
+        lat_delta = np.degrees(radius_km / EARTH_RADIUS_KM)
+        south, north = latitude - lat_delta, latitude + lat_delta
+        rows = np.arange(_grid_rows(np.array(south)), _grid_rows(np.array(north)) + 1)
+        widest = min(max(abs(south), abs(north)), 90.0)
+        if widest >= 89.9:
+            spans = [(0, GRID_COLUMNS - 1)]
+        else:
+            lng_delta = lat_delta / np.cos(np.radians(widest))
+            if lng_delta >= 180:
+                spans = [(0, GRID_COLUMNS - 1)]
+            else:
+                west = int(_grid_columns(np.array(longitude - lng_delta)))
+                east = int(_grid_columns(np.array(longitude + lng_delta)))
+                # A box across the antimeridian wraps round to the first column
+                spans = (
+                    [(west, east)]
+                    if west <= east
+                    else [(west, GRID_COLUMNS - 1), (0, east)]
+                )
+        slices = []
+        for first, last in spans:
+            starts = np.searchsorted(
+                snapshot.cells, rows * GRID_COLUMNS + first, "left"
+            )
+            ends = np.searchsorted(snapshot.cells, rows * GRID_COLUMNS + last, "right")
+            slices.extend(
+                snapshot.order[start:end]
+                for start, end in zip(starts, ends)
+                if end > start
+            )
+        return np.concatenate(slices) if slices else np.empty(0, dtype=np.int64)
+
+    def nearby(self, latitude, longitude, radius_km):
+        """
+        Properties with a location within `radius_km` of the point, nearest
+        first, each at its closest location.
+        Returns (property_ids, distances_km) arrays.
+        """
+        snapshot = self.snapshot
+        candidates = self._candidates(snapshot, latitude, longitude, radius_km)
+        lat1, lng1 = np.radians(latitude), np.radians(longitude)
+        lat2 = snapshot.radians[0][candidates]
+        lng2 = snapshot.radians[1][candidates]
+        a = (
+            np.sin((lat2 - lat1) / 2) ** 2
+            + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+        )
+        distances = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+        within = distances <= radius_km
+        candidates, distances = candidates[within], distances[within]
+        by_distance = np.argsort(distances, kind="stable")
+        property_ids = snapshot.property_ids[candidates[by_distance]]
+        distances = distances[by_distance]
+        # The first occurrence of each property is its closest location
+        _, first = np.unique(property_ids, return_index=True)
+        first.sort()
+        return property_ids[first], distances[first]
+
+
+spatial_index = SpatialIndex()
+
+
+def nearby_properties(latitude, longitude, radius_km):
+    spatial_index.refresh()
+    return spatial_index.nearby(latitude, longitude, radius_km)
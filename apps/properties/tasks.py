@@ -0,0 +1,134 @@
+import logging
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
+from django.utils import timezone
+
+from .models import Property
+
+logger = logging.getLogger(__name__)
+
+# Purged before the rest so a batch of documents does not cascade into
+# thousands of chunks in one transaction
+PURGE_FIRST = ["ai_assistant.PropertyEmbedding", "ai_assistant.PropertyChatHistory"]
+
+
+def _purge_relations():
+    """
+    Every relation that cascades from Property, heaviest first.
+    """
+    relations = [
+        relation
+        for relation in Property._meta.related_objects
+        if relation.on_delete is models.CASCADE
+    ]
+    return sorted(
+        relations,
+        key=lambda relation: (
+            PURGE_FIRST.index(relation.related_model._meta.label)
+            if relation.related_model._meta.label in PURGE_FIRST
+            else len(PURGE_FIRST)
+        ),
+    )
+
+
+def _delete_files(files):
+    for storage, name in files:
+        try:
+            storage.delete(name)
+        except Exception as e:
+            logger.warning(f"Could not delete purged file {name}: {e}")
+
+
+def _purge_batch(relation, property_id, batch_size):
+    """
+    Delete up to `batch_size` rows of one relation in a short transaction, and
+    their files once it has committed. Returns the number of rows deleted.
+    """
+    model = relation.related_model
+    file_fields = [
+        field
+        for field in model._meta.concrete_fields
+        if isinstance(field, models.FileField)
+    ]
+    rows = list(
+        model._base_manager.filter(**{relation.field.attname: property_id})
+        .only("pk", *(field.name for field in file_fields))
+        .order_by("pk")[:batch_size]
+    )
+    if not rows:
+        return 0
+    files = [
+        (field.storage, getattr(row, field.attname).name)
+        for row in rows
+        for field in file_fields
+        if getattr(row, field.attname)
+    ]
+    with transaction.atomic():
+        model._base_manager.filter(pk__in=[row.pk for row in rows]).delete()
+        transaction.on_commit(lambda: _delete_files(files))
+    return len(rows)
+
+
+@contextmanager
+def purge_lock(property_id):
+    """
+    Cluster-wide lock on purging one property, held in the shared cache.
+    Yields False at once when another worker holds it. It expires after
+    PROPERTY_PURGE_LOCK_TIMEOUT so a worker that died cannot block the purge.
+    """
+    key = f"property_purge_lock:{property_id}"
+    owner = uuid.uuid4().hex
+    acquired = cache.add(key, owner, settings.PROPERTY_PURGE_LOCK_TIMEOUT)
+    try:
+        yield acquired
+    finally:
+        if acquired and cache.get(key) == owner:
+            cache.delete(key)
+
+
+@shared_task
+def purge_deleted_property(property_id):
+    """
+    Remove a soft-deleted property's related rows and files in batches of
+    PROPERTY_PURGE_BATCH_SIZE, then the property itself.
+    """
+    with purge_lock(property_id) as acquired:
+        if not acquired:
+            # The hourly sweep queues it again should that purge not finish
+            logger.info(f"Property {property_id} is already being purged.")
+            return
+        property_instance = Property.all_objects.filter(
+            pk=property_id, deleted_at__isnull=False
+        ).first()
+        if not property_instance:
+            logger.info(f"Property {property_id} is not awaiting purge.")
+            return
+        purged = 0
+        for relation in _purge_relations():
+            while True:
+                count = _purge_batch(
+                    relation, property_id, settings.PROPERTY_PURGE_BATCH_SIZE
+                )
+                if not count:
+                    break
+                purged += count
+        property_instance.delete()
+    logger.info(f"Purged property {property_id} and {purged} related rows.")
+
+
+@shared_task
+def purge_deleted_properties():
+    """
+    Queue purges that never ran, e.g. because no worker was up at delete time.
+    """
+    cutoff = timezone.now() - timedelta(hours=1)
+    for property_id in Property.all_objects.filter(deleted_at__lt=cutoff).values_list(
+        "id", flat=True
+    ):
+        purge_deleted_property.delay(property_id)
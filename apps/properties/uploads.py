@@ -0,0 +1,117 @@
+from django.core.files.uploadhandler import FileUploadHandler
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+# Bytes read before a file's type is decided
+SNIFF_BYTES = 16
+# Allowance for form fields and multipart boundaries in the request size check
+FORM_OVERHEAD_BYTES = 64 * 1024
+
+FILE_SIGNATURES = {
+    "pdf": lambda head: head.startswith(b"%PDF-"),
+    "jpeg": lambda head: head.startswith(b"\xff\xd8\xff"),
+    "png": lambda head: head.startswith(b"\x89PNG\r\n\x1a\n"),
+    "gif": lambda head: head[:6] in (b"GIF87a", b"GIF89a"),
+    "webp": lambda head: head[:4] == b"RIFF" and head[8:12] == b"WEBP",
+    "mp4": lambda head: head[4:8] == b"ftyp",
+    "webm": lambda head: head.startswith(b"\x1a\x45\xdf\xa3"),
+    "ogg": lambda head: head.startswith(b"OggS"),
+}
+
+
+class UploadTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = "Upload is too large."
+    default_code = "upload_too_large"
+
+
+class UnsupportedUpload(APIException):
+    status_code = status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+    default_detail = "Unsupported file type."
+    default_code = "unsupported_upload"
+
+
+class ValidatingUploadHandler(FileUploadHandler):
+    """
+    Checks uploads while they stream in, ahead of the handlers that spool them
+    to memory or disk. A request is refused before its body is read when its
+    Content-Length cannot fit, and a file as soon as its first bytes show the
+    wrong type or it grows past `max_size`; the rest of the body is never read.
+    """
+
+    max_size = None
+    max_files = 1
+    allowed_types = []
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding):
+        self.file_count = 0
+        limit = self.max_size * self.max_files + FORM_OVERHEAD_BYTES
+        if content_length > limit:
+            raise UploadTooLarge(self._size_message())
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.file_count += 1
+        if self.file_count > self.max_files:
+            raise UploadTooLarge(
+                f"You can upload a maximum of {self.max_files} file(s) at once."
+            )
+        self.head = b""
+        self.sniffed = False
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > self.max_size:
+            raise UploadTooLarge(self._size_message())
+        if not self.sniffed:
+            self.head += raw_data[: SNIFF_BYTES - len(self.head)]
+            if len(self.head) >= SNIFF_BYTES:
+                self._sniff()
+        # Passed on unchanged to the handler that stores the file
+        return raw_data
+
+    def file_complete(self, file_size):
+        if not self.sniffed:
+            # Files shorter than SNIFF_BYTES
+            self._sniff()
+        return None
+
+    def _sniff(self):
+        self.sniffed = True
+        if not any(FILE_SIGNATURES[name](self.head) for name in self.allowed_types):
+            raise UnsupportedUpload(
+                f"{self.file_name} is not a supported file. Allowed types are: "
+                f"{', '.join(self.allowed_types)}."
+            )
+
+    def _size_message(self):
+        return f"Files cannot exceed {self.max_size // (1024 * 1024)}MB each."
+
+
+class DocumentUploadHandler(ValidatingUploadHandler):
+    max_size = 100 * 1024 * 1024
+    allowed_types = ["pdf"]
+
+
+class ImageUploadHandler(ValidatingUploadHandler):
+    max_size = 5 * 1024 * 1024
+    max_files = 10
+    allowed_types = ["jpeg", "png", "gif", "webp"]
+
+
+class VideoUploadHandler(ValidatingUploadHandler):
+    max_size = 100 * 1024 * 1024
+    allowed_types = ["mp4", "webm", "ogg"]
+
+
+class ValidatedUploadMixin:
+    """
+    Puts the view's `upload_handler_class` in front of the default upload
+    handlers, before anything reads the request body.
+    """
+
+    upload_handler_class = None
+
+    def initialize_request(self, request, *args, **kwargs):
+        if self.upload_handler_class:
+            request.upload_handlers.insert(0, self.upload_handler_class(request))
+        return super().initialize_request(request, *args, **kwargs)
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 
+from apps.accounts.models import User
 from services import PROPERTY_STATUS_CHOICES, PROPERTY_TYPES
 
 from ..models import Document, Property, PropertyImage, PropertyVideo, PropertyLocation
@@ -71,6 +72,9 @@ class PropertySerializer(serializers.ModelSerializer):
     square_feet = serializers.CharField(required=False)
     property_type = serializers.ChoiceField(choices=PROPERTY_TYPES)
     status = serializers.ChoiceField(choices=PROPERTY_STATUS_CHOICES)
+    # Only present in full-text search results
+    search_rank = serializers.FloatField(read_only=True)
+    search_snippet = serializers.CharField(read_only=True)
 
     class Meta:
         model = Property
@@ -86,6 +90,8 @@ class PropertySerializer(serializers.ModelSerializer):
             "status",
             "for_sale",
             "for_rent",
+            "search_rank",
+            "search_snippet",
         ]
 
 
@@ -111,4 +117,70 @@ class PropertyLocationSerializer(serializers.ModelSerializer):
             Property.objects.get(pk=value)
         except Property.DoesNotExist:
             raise ValidationError("Invalid property ID.")
-        return value
\ No newline at end of file
+        return value
+
+
+class AgentSummarySerializer(serializers.ModelSerializer):
+    # None for agents who have not set up a profile
+    agency_name = serializers.CharField(
+        source="agentprofile.agency_name", read_only=True
+    )
+
+    class Meta:
+        model = User
+        fields = [
+            "id",
+            "first_name",
+            "last_name",
+            "email",
+            "whatsapp_number",
+            "agency_name",
+        ]
+
+
+class OverviewImageSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PropertyImage
+        fields = ["id", "image"]
+
+
+class OverviewVideoSerializer(serializers.ModelSerializer):
+    video = serializers.FileField(source="image", read_only=True)
+
+    class Meta:
+        model = PropertyVideo
+        fields = ["id", "video"]
+
+
+class OverviewLocationSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PropertyLocation
+        fields = ["id", "latitude", "longitude"]
+
+
+class OverviewDocumentSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Document
+        fields = ["id", "document_type", "file"]
+
+
+class PropertyOverviewSerializer(PropertySerializer):
+    """
+    A property with its media, locations, documents and agent, read from the
+    relations prefetched by PropertyViewSet.overview.
+    """
+
+    agent = AgentSummarySerializer(source="assigned_agent", read_only=True)
+    images = OverviewImageSerializer(source="property_image", many=True, read_only=True)
+    videos = OverviewVideoSerializer(source="property_video", many=True, read_only=True)
+    locations = OverviewLocationSerializer(
+        source="property_location", many=True, read_only=True
+    )
+    documents = OverviewDocumentSerializer(many=True, read_only=True)
+
+    class Meta(PropertySerializer.Meta):
+        fields = [
+            field
+            for field in PropertySerializer.Meta.fields
+            if field not in ("search_rank", "search_snippet")
+        ] + ["agent", "images", "videos", "locations", "documents"]
@@ -1,19 +1,56 @@
-import math
+import hashlib
+import operator
 from datetime import timedelta
+from functools import reduce
 
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
 from django.utils import timezone
+from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
 from apps.accounts.permission import HasActiveSubscription, IsAgent
-from services import CustomResponseMixin
+from apps.ai_assistant.ai_functions.listing_search import search_listings
+from services import (
+    CachedListMixin,
+    ConditionalGetMixin,
+    CustomResponseMixin,
+    KeysetPagination,
+)
+from services.list_cache import current_generation, normalized_query
 
+from ..facets import facet_counts
+from ..filters import PropertyFilter, PropertySearchFilter
+from ..geo import covering_cells, haversine_km
 from ..models import Document, Property, PropertyLocation , PropertyImage, PropertyVideo
-from .serializers import DocumentSerializer, PropertySerializer , PropertyImageSerializer , PropertyVideoSerializer , PropertyLocationSerializer
+from ..new_listings import (
+    NEW_LISTINGS_DAYS,
+    NewListingsPagination,
+    new_listings_feed,
+)
+from ..signals import (
+    PROPERTY_LIST_GENERATION_KEY,
+    PROPERTY_OVERVIEW_GENERATION_TIMEOUT,
+    property_overview_generation_key,
+)
+from ..spatial_index import nearby_properties
+from ..tasks import purge_deleted_property
+from ..uploads import (
+    DocumentUploadHandler,
+    ImageUploadHandler,
+    ValidatedUploadMixin,
+    VideoUploadHandler,
+)
+from .serializers import DocumentSerializer, PropertySerializer , PropertyImageSerializer , PropertyVideoSerializer , PropertyLocationSerializer, PropertyOverviewSerializer
 
 
 class CustomResponseModelViewSet(CustomResponseMixin, viewsets.ModelViewSet):
@@ -63,54 +100,152 @@ class CustomResponseModelViewSet(CustomResponseMixin, viewsets.ModelViewSet):
         )
 
 
+NEARBY_MAX_RADIUS_KM = 200
+
+
 ### 🔹 Property ViewSet (Main API)
-class PropertyViewSet(CustomResponseModelViewSet):
+class PropertyViewSet(ConditionalGetMixin, CachedListMixin, CustomResponseModelViewSet):
     """ViewSet for managing property listings"""
 
     queryset = Property.objects.all()
     serializer_class = PropertySerializer
+    filter_backends = [DjangoFilterBackend, PropertySearchFilter]
+    filterset_class = PropertyFilter
     search_fields = ["title", "description"]
-    ordering_fields = ["price", "created_at", "square_feet"]
+    pagination_class = KeysetPagination
+    # Each is served by one of Property's keyset indexes
+    keyset_orderings = {
+        "-created_at": ("-created_at", "-id"),
+        "created_at": ("created_at", "id"),
+        "price": ("price", "id"),
+        "-price": ("-price", "-id"),
+    }
+    list_cache_generation_key = PROPERTY_LIST_GENERATION_KEY
 
     def get_permissions(self):
         """Assign permissions based on request method"""
-        if self.action in ["list", "retrieve", "nearby"]:
+        if self.action in [
+            "list",
+            "retrieve",
+            "nearby",
+            "search",
+            "overview",
+            "facets",
+        ]:
             permission_classes = [AllowAny]
         else:
             permission_classes = [IsAuthenticated, IsAgent, HasActiveSubscription]
         return [permission() for permission in permission_classes]
 
     @extend_schema(
-        description="Retrieve properties listed in the last 7 days",
+        description=(
+            "Retrieve properties listed in the last 7 days, newest first, a "
+            "page at a time"
+        ),
         responses={200: PropertySerializer(many=True)},
         request=PropertySerializer,
     )
     @action(detail=False, methods=["get"])
     def new_listings(self, request):
         """Returns properties listed in the last 7 days"""
-        recent = timezone.now() - timedelta(days=7)
-        queryset = self.filter_queryset(self.get_queryset()).filter(
-            created_at__gte=recent
+        filterset = self.filterset_class(request.query_params)
+        if any(name in request.query_params for name in filterset.filters) or (
+            request.query_params.get(PropertySearchFilter.search_param)
+        ):
+            # Filtered feeds are paged through the created_at index instead
+            paginator = KeysetPagination()
+            recent = timezone.now() - timedelta(days=NEW_LISTINGS_DAYS)
+            queryset = self.filter_queryset(self.get_queryset()).filter(
+                created_at__gte=recent
+            )
+            page = paginator.paginate_queryset(queryset, request, view=self)
+        else:
+            # The precomputed feed, so a page costs the same however busy the week
+            paginator = NewListingsPagination()
+            page = paginator.paginate_queryset(new_listings_feed, request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return self.custom_response(
+            data=paginator.get_paginated_response(serializer.data).data
+        )
+
+    @extend_schema(
+        description=(
+            "Semantic search over listing titles and descriptions. The usual "
+            "property filters (price_min, price_max, property_type, status, "
+            "bedrooms_min, ...) restrict which listings are ranked."
+        ),
+        parameters=[
+            OpenApiParameter("q", description="Free-text search query", type=str),
+            OpenApiParameter(
+                "limit", description="Number of results (max 100)", type=int, default=20
+            ),
+        ],
+        responses={200: PropertySerializer(many=True)},
+    )
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        """Rank listings by similarity to a free-text query"""
+        query = request.query_params.get("q", "").strip()
+        try:
+            limit = min(int(request.query_params.get("limit", 20)), 100)
+        except ValueError:
+            limit = 0
+        if not query or limit < 1:
+            return self.custom_response(
+                message="A search query `q` and a positive `limit` are required.",
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        filterset = PropertyFilter(request.query_params, queryset=self.get_queryset())
+        if not filterset.is_valid():
+            return self.custom_response(
+                data=filterset.errors, status=status.HTTP_400_BAD_REQUEST
+            )
+        allowed_ids = None
+        if any(name in request.query_params for name in filterset.filters):
+            # Applied as a bitmap before ranking, so filtered searches still
+            # return `limit` matches
+            allowed_ids = filterset.qs.values_list("id", flat=True)
+
+        results = search_listings(query, allowed_ids, limit)
+        if results is None:
+            return self.custom_response(
+                message="Failed to generate query embedding.",
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+        properties = Property.objects.in_bulk([pk for pk, _ in results])
+        data = []
+        for pk, score in results:
+            if pk in properties:  # Deleted since the index was refreshed
+                item = self.get_serializer(properties[pk]).data
+                item["score"] = round(score, 4)
+                data.append(item)
+        return self.custom_response(
+            message="Properties data fetched successfully", data=data
         )
-        serializer = self.get_serializer(queryset, many=True)
-        return self.custom_response(data=serializer.data)
 
     @extend_schema(
-        description="Find properties within a given radius based on latitude and longitude",
+        description=(
+            "Find properties within a given radius based on latitude and "
+            "longitude, nearest first, with each property's `distance_km`"
+        ),
         parameters=[
             OpenApiParameter("lat", description="Latitude of the location", type=float),
             OpenApiParameter(
                 "lng", description="Longitude of the location", type=float
             ),
             OpenApiParameter(
-                "radius", description="Search radius in km", type=float, default=10
+                "radius",
+                description=f"Search radius in km (max {NEARBY_MAX_RADIUS_KM})",
+                type=float,
+                default=10,
             ),
         ],
         responses={200: PropertySerializer(many=True)},
     )
     @action(detail=False, methods=["get"])
     def nearby(self, request):
-        """Find properties within a radius of given coordinates"""
+        """Find properties within a radius of given coordinates, nearest first"""
         lat = request.query_params.get("lat")
         lng = request.query_params.get("lng")
 
@@ -126,27 +261,141 @@ class PropertyViewSet(CustomResponseModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Calculate lat/lng deltas
-        lat_delta = radius / 111.0
-        lng_delta = radius / (111.320 * math.cos(math.radians(lat)))
+        if not (
+            -90 <= lat <= 90 and -180 <= lng <= 180 and 0 < radius <= NEARBY_MAX_RADIUS_KM
+        ):
+            return Response(
+                {
+                    "error": "Latitude, longitude or radius out of range "
+                    f"(radius is at most {NEARBY_MAX_RADIUS_KM} km)"
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if settings.NEARBY_IN_MEMORY_INDEX:
+            property_ids, distances = nearby_properties(lat, lng, radius)
+            ranked = list(zip(property_ids.tolist(), distances.tolist()))
+        else:
+            ranked = self.nearby_from_database(lat, lng, radius)
+
+        # Only the requested page is loaded from the database. Pages are
+        # numbered: results are ranked by distance, which has no index to seek
+        paginator = PageNumberPagination()
+        page = paginator.paginate_queryset(ranked, request, view=self)
+        properties = Property.objects.in_bulk([pk for pk, _ in page])
+        data = []
+        for pk, distance in page:
+            if pk in properties:
+                item = self.get_serializer(properties[pk]).data
+                item["distance_km"] = round(distance, 3)
+                data.append(item)
+        return self.custom_response(
+            data=paginator.get_paginated_response(data).data, status=status.HTTP_200_OK
+        )
+
+    def nearby_from_database(self, lat, lng, radius):
+        """Properties within the radius as [(id, distance_km)], nearest first"""
+        # Candidates come from the geohash cells covering the circle through
+        # the index; the exact distance then drops those outside it
+        cells = covering_cells(lat, lng, radius)
+        candidates = PropertyLocation.objects.filter(
+            reduce(operator.or_, (Q(geohash__startswith=cell) for cell in cells)),
+            property__deleted_at__isnull=True,
+        ).values_list("property_id", "latitude", "longitude")
+        distances = {}
+        for property_id, latitude, longitude in candidates:
+            distance = haversine_km(lat, lng, latitude, longitude)
+            # A property with several locations counts at its closest
+            if distance <= radius and distance < distances.get(property_id, radius + 1):
+                distances[property_id] = distance
+        return sorted(distances.items(), key=lambda item: item[1])
+
+    @extend_schema(
+        description=(
+            "Count the properties matching the filters and `search`, in total "
+            "and per property type, status, sale/rent flag, bedroom count and "
+            "price bucket"
+        ),
+    )
+    @action(detail=False, methods=["get"])
+    def facets(self, request):
+        """Facet counts for a filter set, cached per normalized filter"""
+        names = {*self.filterset_class.base_filters, PropertySearchFilter.search_param}
+        query = normalized_query(request, names)
+        generation = current_generation(PROPERTY_LIST_GENERATION_KEY)
+        etag, last_modified = self._generation_validators(
+            generation, request.path, query
+        )
+        key = f"facets:{generation}:{hashlib.md5(query.encode()).hexdigest()}"
+
+        def build_response():
+            data = cache.get(key)
+            if data is None:
+                data = facet_counts(self.filter_queryset(self.get_queryset()))
+                cache.set(key, data, timeout=settings.LIST_CACHE_TIMEOUT)
+            return self.custom_response(
+                message="Property facets fetched successfully", data=data
+            )
+
+        return self._conditional(request, etag, last_modified, build_response)
 
-        # Filter properties within bounding box
-        queryset = Property.objects.filter(
-            latitude__gte=lat - lat_delta,
-            latitude__lte=lat + lat_delta,
-            longitude__gte=lng - lng_delta,
-            longitude__lte=lng + lng_delta,
+    @extend_schema(
+        description=(
+            "Retrieve a property with its images, videos, locations, documents "
+            "and agent in one response"
+        ),
+        responses={200: PropertyOverviewSerializer},
+    )
+    @action(detail=True, methods=["get"])
+    def overview(self, request, pk=None):
+        """Everything a property page shows, cached as one unit"""
+        # Read before the overview is built, as for cached lists
+        generation = current_generation(
+            property_overview_generation_key(pk), PROPERTY_OVERVIEW_GENERATION_TIMEOUT
         )
+        etag, last_modified = self._generation_validators(generation, request.path)
+        url = request.build_absolute_uri(request.path)
+        key = f"property_overview:{generation}:{hashlib.md5(url.encode()).hexdigest()}"
+
+        def build_response():
+            data = cache.get(key)
+            if data is None:
+                # Five queries whatever the property has: the property with
+                # its agent and agency, then one per related list
+                queryset = (
+                    self.get_queryset()
+                    .select_related("assigned_agent__agentprofile")
+                    .prefetch_related(
+                        "property_image",
+                        "property_video",
+                        "property_location",
+                        "documents",
+                    )
+                )
+                instance = get_object_or_404(queryset, pk=pk)
+                data = PropertyOverviewSerializer(
+                    instance, context=self.get_serializer_context()
+                ).data
+                cache.set(key, data, timeout=settings.LIST_CACHE_TIMEOUT)
+            return self.custom_response(
+                message="Property  data fetched successfully", data=data
+            )
+
+        return self._conditional(request, etag, last_modified, build_response)
 
-        serializer = self.get_serializer(queryset, many=True)
-        return self.custom_response(data=serializer.data, status=status.HTTP_200_OK)
     def perform_create(self, serializer):
         serializer.save(assigned_agent=self.request.user)
 
+    def perform_destroy(self, instance):
+        """Hide the property now; its rows and files are purged in the background"""
+        instance.soft_delete()
+        transaction.on_commit(lambda: purge_deleted_property.delay(instance.id))
+
 
-class DocumentViewSet(CustomResponseModelViewSet):
-    queryset = Document.objects.all()
+class DocumentViewSet(ConditionalGetMixin, ValidatedUploadMixin, CustomResponseModelViewSet):
+    queryset = Document.objects.filter(property__deleted_at__isnull=True)
     serializer_class = DocumentSerializer
+    upload_handler_class = DocumentUploadHandler
     parser_classes = (MultiPartParser, FormParser)
 
     def get_permissions(self):
@@ -158,9 +407,11 @@ class DocumentViewSet(CustomResponseModelViewSet):
         return [permission() for permission in permission_classes]
 
 
-class PropertyImageViewSet(CustomResponseModelViewSet):
-    queryset = PropertyImage.objects.all()
+class PropertyImageViewSet(ConditionalGetMixin, CachedListMixin, ValidatedUploadMixin, CustomResponseModelViewSet):
+    queryset = PropertyImage.objects.filter(property__deleted_at__isnull=True)
+    list_cache_generation_key = PROPERTY_LIST_GENERATION_KEY
     serializer_class = PropertyImageSerializer
+    upload_handler_class = ImageUploadHandler
     def get_permission(self):
         "Assign permission based on request method"
         if self.action in ["list", "retrieve"]:
@@ -181,9 +432,10 @@ class PropertyImageViewSet(CustomResponseModelViewSet):
             return self.custom_response(data=response_serializer.data, status=status.HTTP_201_CREATED)
         return self.custom_response(data=serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class PropertyVideoViewSet(CustomResponseModelViewSet):
-    queryset = PropertyVideo.objects.all()
+class PropertyVideoViewSet(ConditionalGetMixin, ValidatedUploadMixin, CustomResponseModelViewSet):
+    queryset = PropertyVideo.objects.filter(property__deleted_at__isnull=True)
     serializer_class = PropertyVideoSerializer
+    upload_handler_class = VideoUploadHandler
     def get_permission(self):
         "Assign permission based on request method"
         if self.action in ["list", "retrieve"]:
@@ -191,8 +443,9 @@ class PropertyVideoViewSet(CustomResponseModelViewSet):
         else:
             permission_classes = [IsAuthenticated, IsAgent, HasActiveSubscription]
         return [permission() for permission in permission_classes]
-class PropertyLocationViewSet(CustomResponseModelViewSet):
-    queryset = PropertyLocation.objects.all()
+class PropertyLocationViewSet(ConditionalGetMixin, CachedListMixin, CustomResponseModelViewSet):
+    queryset = PropertyLocation.objects.filter(property__deleted_at__isnull=True)
+    list_cache_generation_key = PROPERTY_LIST_GENERATION_KEY
     serializer_class =  PropertyLocationSerializer
     def get_permission(self):
         "Assign permission based on request method"
@@ -200,4 +453,4 @@ class PropertyLocationViewSet(CustomResponseModelViewSet):
             permission_classes = [AllowAny]
         else:
             permission_classes = [IsAuthenticated, IsAgent, HasActiveSubscription]
-        return [permission() for permission in permission_classes]
\ No newline at end of file
+        return [permission() for permission in permission_classes]
\ No newline at end of file
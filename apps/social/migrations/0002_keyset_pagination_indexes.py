@@ -0,0 +1,23 @@
+# Generated by Django 5.1.7 on 2026-10-19 15:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("properties", "0008_keyset_pagination_indexes"),
+        ("social", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="favourite",
+            index=models.Index(
+                fields=["user", "created_at", "id"],
+                name="favourite_user_created_at_idx",
+            ),
+        ),
+    ]
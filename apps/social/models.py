@@ -21,6 +21,13 @@ class Favourite(Audit):
             "user",
             "property",
         )  # Ensure a user can only like a property once
+        indexes = [
+            # Keyset pagination of a user's favourites, latest first
+            models.Index(
+                fields=["user", "created_at", "id"],
+                name="favourite_user_created_at_idx",
+            ),
+        ]
 
 
 class Follow(Audit):
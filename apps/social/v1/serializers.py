@@ -6,7 +6,7 @@ from ..models import Favourite, Property
 class PropertySerializer(serializers.ModelSerializer):
     class Meta:
         model = Property
-        fields = ["id", "name", "location", "price", "description", "image"]
+        fields = ["id", "title", "price", "description", "property_type", "status"]
 
 
 class FavouritePropertySerializer(serializers.ModelSerializer):
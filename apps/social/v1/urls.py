@@ -1,8 +1,13 @@
 from django.urls import include, path
 
-from .views import FavouritePropertyView
+from .views import FavouritePropertyListView, FavouritePropertyView
 
 urlpatterns = [
+    path(
+        "favourite-property/",
+        FavouritePropertyListView.as_view(),
+        name="favourite-property-list",
+    ),
     path(
         "favourite-property/<int:property_id>/",
         FavouritePropertyView.as_view(),
@@ -1,11 +1,11 @@
 from django.http import Http404
 from django.shortcuts import get_object_or_404
-from rest_framework import status, views
+from rest_framework import generics, status, views
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 
 from apps.properties.models import Property
-from services import CustomResponseMixin, EmailService
+from services import CustomResponseMixin, EmailService, KeysetPagination
 
 from ..models import Favourite
 from .serializers import PropertySerializer
@@ -71,15 +71,26 @@ class FavouritePropertyView(APIView, CustomResponseMixin):
                 message="Property was not liked.", status=status.HTTP_400_BAD_REQUEST
             )
 
-    def get(self, request):
-        user = request.user
-        favourite_properties = Favourite.objects.filter(user=user)
-        properties = Property.objects.filter(
-            id__in=[f.property.id for f in favourite_properties]
+
+class FavouritePropertyListView(generics.ListAPIView, CustomResponseMixin):
+    """The user's favourite properties, most recently liked first"""
+
+    permission_classes = [IsAuthenticated]
+    serializer_class = PropertySerializer
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        return Favourite.objects.filter(
+            user=self.request.user, property__deleted_at__isnull=True
+        ).select_related("property")
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.get_queryset())
+        serializer = self.get_serializer(
+            [favourite.property for favourite in page], many=True
         )
-        serializer = PropertySerializer(properties, many=True)
         return self.custom_response(
-            data=serializer.data,
+            data=self.get_paginated_response(serializer.data).data,
             status=status.HTTP_200_OK,
             message="Favourite properties fetched successfully",
         )
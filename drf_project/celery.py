@@ -20,5 +20,9 @@ app.conf.update(
             "task": "subscription.tasks.deactivate_expired_subscriptions",
             "schedule": crontab(minute=0, hour=0),  # Run every midnight
         },
+        "purge-deleted-properties": {
+            "task": "apps.properties.tasks.purge_deleted_properties",
+            "schedule": crontab(minute=30),  # Run hourly
+        },
     }
 )
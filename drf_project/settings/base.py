@@ -205,12 +205,75 @@ CELERY_RESULT_BACKEND = CELERY_BROKER_URL
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
+# Start a worker with `-Q ocr` so long scans never delay regular ingestion
+CELERY_TASK_ROUTES = {
+    "apps.ai_assistant.tasks.ingest_heavy_document": {"queue": "ocr"},
+}
+
+# Shared across web processes and Celery workers (rate limits, retrieval caches)
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": config("CACHE_REDIS_URL", default="redis://127.0.0.1:6379/1"),
+    }
+}
+
+# Serve nearby searches from an in-memory index of every property location
+# in each web process, instead of querying the database
+NEARBY_IN_MEMORY_INDEX = config("NEARBY_IN_MEMORY_INDEX", default=True, cast=bool)
+# Upper bound on how long a cached public list response is kept; writes make
+# it stale straight away by moving to a new generation
+LIST_CACHE_TIMEOUT = config("LIST_CACHE_TIMEOUT", default=600, cast=int)
+# Rows per transaction when a deleted property is purged in the background
+PROPERTY_PURGE_BATCH_SIZE = config("PROPERTY_PURGE_BATCH_SIZE", default=500, cast=int)
+# Seconds a purge holds its property's lock; a worker that died frees it then
+PROPERTY_PURGE_LOCK_TIMEOUT = config("PROPERTY_PURGE_LOCK_TIMEOUT", default=3600, cast=int)
 
 
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 
 OPENAI_API_KEY = config("OPENAI_API_KEY")
 
+# AI assistant document ingestion
+# Used until an active EmbeddingGeneration exists; see `manage.py embedding_generations`
+EMBEDDING_MODEL = "text-embedding-ada-002"
+EMBEDDING_DIMENSIONS = 1536
+EMBEDDING_CHUNK_TOKENS = config("EMBEDDING_CHUNK_TOKENS", default=500, cast=int)
+EMBEDDING_CHUNK_OVERLAP = config("EMBEDDING_CHUNK_OVERLAP", default=50, cast=int)
+EMBEDDING_BATCH_SIZE = config("EMBEDDING_BATCH_SIZE", default=100, cast=int)
+EMBEDDING_MAX_RETRIES = config("EMBEDDING_MAX_RETRIES", default=5, cast=int)
+# Documents whose estimated extraction takes longer go to the OCR queue
+INGESTION_HEAVY_SECONDS = config("INGESTION_HEAVY_SECONDS", default=60, cast=int)
+# Only one worker ingests a document at a time; the lock outlives the longest
+# expected run, and a task that finds it held retries after the delay
+INGESTION_LOCK_TIMEOUT = config("INGESTION_LOCK_TIMEOUT", default=3600, cast=int)
+INGESTION_LOCK_RETRY_DELAY = config("INGESTION_LOCK_RETRY_DELAY", default=30, cast=int)
+
+# Cluster-wide OpenAI quotas; the limiter targets this fraction of them
+OPENAI_RATE_LIMIT_HEADROOM = config(
+    "OPENAI_RATE_LIMIT_HEADROOM", default=0.9, cast=float
+)
+EMBEDDING_REQUESTS_PER_MINUTE = config(
+    "EMBEDDING_REQUESTS_PER_MINUTE", default=3000, cast=int
+)
+EMBEDDING_TOKENS_PER_MINUTE = config(
+    "EMBEDDING_TOKENS_PER_MINUTE", default=1000000, cast=int
+)
+CHAT_MODEL = config("CHAT_MODEL", default="gpt-3.5-turbo")
+CHAT_MAX_TOKENS = config("CHAT_MAX_TOKENS", default=500, cast=int)
+CHAT_REQUESTS_PER_MINUTE = config("CHAT_REQUESTS_PER_MINUTE", default=3500, cast=int)
+CHAT_TOKENS_PER_MINUTE = config("CHAT_TOKENS_PER_MINUTE", default=160000, cast=int)
+# Listing search embeds title and description with a small model; every
+# listing vector is held in memory by each web process
+LISTING_EMBEDDING_MODEL = "text-embedding-3-small"
+LISTING_EMBEDDING_DIMENSIONS = 256
+# Chat answers from the fact sheet instead of retrieval when it fits this budget
+CHAT_CONTEXT_TOKENS = config("CHAT_CONTEXT_TOKENS", default=1500, cast=int)
+# Properties with more document text than this get no fact sheet
+FACT_SHEET_SOURCE_TOKENS = config("FACT_SHEET_SOURCE_TOKENS", default=6000, cast=int)
+FACT_SHEET_MAX_TOKENS = config("FACT_SHEET_MAX_TOKENS", default=400, cast=int)
+FACT_SHEET_REFRESH_DELAY = config("FACT_SHEET_REFRESH_DELAY", default=30, cast=int)
+
 
 AUTHENTICATION_BACKENDS = [
     "django.contrib.auth.backends.ModelBackend",
@@ -1,11 +1,18 @@
 from services.choices import (
     DOCUMENT_TYPE_CHOICES,
+    EMBEDDING_GENERATION_STATUS_CHOICES,
+    EXTRACTION_PLAN_CHOICES,
+    INGESTION_STAGE_CHOICES,
+    INGESTION_STATUS_CHOICES,
     LEAD_STATUS_CHOICES,
     PROPERTY_STATUS_CHOICES,
     PROPERTY_TYPES,
 )
+from services.conditional import ConditionalGetMixin
 from services.email import EmailService
+from services.list_cache import CachedListMixin
 from services.main import CustomResponseMixin
+from services.pagination import KeysetPagination
 from services.serializers import (
     CreateResponseSerializer,
     ErrorDataResponseSerializer,
@@ -16,8 +23,11 @@ from services.serializers import (
 from services.utils import send_whatsapp_message
 
 __all__ = (
+    "ConditionalGetMixin",
+    "CachedListMixin",
     "CustomResponseMixin",
     "EmailService",
+    "KeysetPagination",
     "DOCUMENT_TYPE_CHOICES",
     "PROPERTY_STATUS_CHOICES",
     "IsAgent",
@@ -25,6 +35,10 @@ __all__ = (
     "IsAdmin",
     "PROPERTY_TYPES",
     "LEAD_STATUS_CHOICES",
+    "INGESTION_STATUS_CHOICES",
+    "INGESTION_STAGE_CHOICES",
+    "EMBEDDING_GENERATION_STATUS_CHOICES",
+    "EXTRACTION_PLAN_CHOICES",
     "SuccessResponseSerializer",
     "ErrorDataResponseSerializer",
     "ErrorResponseSerializer",
@@ -51,3 +51,31 @@ LEAD_STATUS_CHOICES = [
     ("follow_up", "Follow Up"),
     ("closed", "Closed"),
 ]
+INGESTION_STATUS_CHOICES = [
+    ("pending", "Pending"),
+    ("running", "Running"),
+    ("succeeded", "Succeeded"),
+    ("failed", "Failed"),
+]
+INGESTION_STAGE_CHOICES = [
+    ("fingerprint", "Fingerprinting"),
+    ("reuse", "Duplicate Reuse"),
+    ("preflight", "Preflight"),
+    ("stored_text", "Stored Text"),
+    ("extract", "Text Extraction"),
+    ("ocr", "OCR"),
+    ("clean", "Cleaning"),
+    ("chunk", "Chunking"),
+    ("embed", "Embedding"),
+    ("persist", "Persisting"),
+]
+EXTRACTION_PLAN_CHOICES = [
+    ("text", "Text Layer"),
+    ("ocr", "OCR"),
+    ("mixed", "Text Layer and OCR"),
+]
+EMBEDDING_GENERATION_STATUS_CHOICES = [
+    ("active", "Active"),
+    ("backfilling", "Backfilling"),
+    ("retired", "Retired"),
+]
@@ -0,0 +1,99 @@
+import hashlib
+from datetime import datetime, timezone
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from services.list_cache import current_generation, normalized_query
+
+
+class ConditionalGetMixin:
+    """
+    ETag and Last-Modified validators for a viewset's list and retrieve, so a
+    client re-requesting unchanged data gets an empty 304.
+
+    A list's validators come from one aggregate, the latest `last_updated`
+    and the row count of the filtered queryset, and the request's query
+    string. A row added, edited or deleted changes one or the other. The
+    payload is only built when they have changed. Lists only carry a
+    Last-Modified when `get_validator_queryset` includes deleted rows;
+    otherwise deleting the latest row would move it backwards.
+
+    Lists cached by CachedListMixin skip the aggregate: their generation only
+    moves forward and changes with every write, so it is the validator.
+    """
+
+    validator_field = "last_updated"
+    # Whether get_validator_queryset keeps deleted rows, making the latest
+    # `last_updated` of a list move forward on deletion too
+    validators_see_deletions = False
+
+    def get_validator_queryset(self):
+        return self.filter_queryset(self.get_queryset())
+
+    def list(self, request, *args, **kwargs):
+        generation_key = getattr(self, "list_cache_generation_key", None)
+        if generation_key:
+            etag, last_modified = self._generation_validators(
+                current_generation(generation_key),
+                request.path,
+                normalized_query(request),
+            )
+        else:
+            validators = self.get_validator_queryset().aggregate(
+                latest=Max(self.validator_field), count=Count("pk")
+            )
+            etag = self._etag(
+                validators["latest"], validators["count"], request.get_full_path()
+            )
+            last_modified = (
+                validators["latest"] if self.validators_see_deletions else None
+            )
+        return self._conditional(
+            request,
+            etag,
+            last_modified,
+            lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        # Kept for the retrieve below, which would otherwise fetch it again
+        self._validated_object = instance = self.get_object()
+        latest = getattr(instance, self.validator_field)
+        etag = self._etag(instance.pk, latest)
+        return self._conditional(
+            request,
+            etag,
+            latest,
+            lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs),
+        )
+
+    def get_object(self):
+        if getattr(self, "_validated_object", None) is not None:
+            return self._validated_object
+        return super().get_object()
+
+    def _generation_validators(self, generation, *parts):
+        """ETag and Last-Modified of a response cached under `generation`"""
+        # Generations are nanosecond timestamps of the last write
+        last_modified = datetime.fromtimestamp(generation / 1e9, tz=timezone.utc)
+        return self._etag(generation, *parts), last_modified
+
+    def _etag(self, *parts):
+        digest = hashlib.md5(":".join(map(str, parts)).encode()).hexdigest()
+        return quote_etag(digest)
+
+    def _conditional(self, request, etag, last_modified, build_response):
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        # A 304 when the client's copy is current, the full response otherwise
+        response = (
+            get_conditional_response(request, etag=etag, last_modified=timestamp)
+            or build_response()
+        )
+        response["ETag"] = etag
+        if timestamp is not None:
+            response["Last-Modified"] = http_date(timestamp)
+        # Stored by clients, but checked with the validators before each use
+        patch_cache_control(response, no_cache=True)
+        return response
@@ -0,0 +1,66 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def bump_generation(key, timeout=None):
+    """
+    Start a new generation: every response cached under the old one is
+    ignored from now on and left to expire.
+    """
+    cache.set(key, time.time_ns(), timeout=timeout)
+
+
+def current_generation(key, timeout=None):
+    generation = cache.get(key)
+    if generation is None:
+        # Expired, evicted or never set; a fresh value never revives old entries
+        cache.add(key, time.time_ns(), timeout=timeout)
+        generation = cache.get(key)
+    return generation
+
+
+def normalized_query(request, names=None):
+    """
+    The query string with parameters sorted and empty ones dropped, so
+    requests for the same results share an entry. Only the parameters in
+    `names` are kept when it is given.
+    """
+    return urlencode(
+        sorted(
+            (name, value)
+            for name, values in request.query_params.lists()
+            for value in values
+            if value != "" and (names is None or name in names)
+        )
+    )
+
+
+class CachedListMixin:
+    """
+    Serves a viewset's list from the shared cache, keyed by the normalized
+    query string and the generation in `list_cache_generation_key`. Writes
+    that change the list bump the generation, so no keys are ever scanned or
+    deleted.
+    """
+
+    list_cache_generation_key = None
+
+    def list(self, request, *args, **kwargs):
+        # Read before the list is built, so a write during it leaves the
+        # result under a generation that is already stale
+        generation = current_generation(self.list_cache_generation_key)
+        url = f"{request.build_absolute_uri(request.path)}?{normalized_query(request)}"
+        key = f"list:{generation}:{hashlib.md5(url.encode()).hexdigest()}"
+        data = cache.get(key)
+        if data is not None:
+            return Response(data, status=status.HTTP_200_OK)
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, timeout=settings.LIST_CACHE_TIMEOUT)
+        return response
@@ -0,0 +1,169 @@
+import base64
+import binascii
+import json
+from datetime import date
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+PRIMARY_KEY_ORDERINGS = {"id", "-id", "pk", "-pk"}
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination that seeks to the row after the last one served instead
+    of counting rows and skipping an OFFSET, so page N costs the same as page 1.
+
+    A view lists the orderings it allows in `keyset_orderings`, each a tuple
+    of non-null model fields ending in a unique one, ideally with an index
+    over the same fields. `?ordering=` picks one; the first is the default.
+    An ordering a filter has already applied is kept when it ends in the
+    primary key, e.g. full-text search results by rank.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    ordering_query_param = "ordering"
+    orderings = {"-created_at": ("-created_at", "-id")}
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request)
+        if position is not None:
+            try:
+                queryset = queryset.filter(self.after(position))
+            except (ValidationError, ValueError, TypeError):
+                raise NotFound(self.invalid_cursor_message)
+        page_size = self.get_page_size(request)
+        # One row more than the page tells whether there is a next page
+        rows = list(queryset[: page_size + 1])
+        self.has_next = len(rows) > page_size
+        self.page = rows[:page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def get_orderings(self, view):
+        return getattr(view, "keyset_orderings", self.orderings)
+
+    def get_ordering(self, request, queryset, view):
+        applied = tuple(queryset.query.order_by)
+        if (
+            applied
+            and all(isinstance(field, str) for field in applied)
+            and applied[-1] in PRIMARY_KEY_ORDERINGS
+        ):
+            return applied
+        orderings = self.get_orderings(view)
+        requested = request.query_params.get(self.ordering_query_param)
+        return orderings.get(requested, next(iter(orderings.values())))
+
+    def after(self, values):
+        """
+        Rows past `values` in the ordering: equal on the leading fields and
+        beyond it on the next, in that field's direction.
+        """
+        condition, equal = Q(), Q()
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        # Implied by the condition, but lets the database start an index range
+        # scan at the cursor instead of filtering every row before it
+        first = self.ordering[0]
+        bound = "lte" if first.startswith("-") else "gte"
+        return Q(**{f"{first.lstrip('-')}__{bound}": values[0]}) & condition
+
+    def encode_cursor(self, row):
+        values = []
+        for field in self.ordering:
+            value = getattr(row, field.lstrip("-"))
+            if isinstance(value, date):
+                value = value.isoformat()
+            elif isinstance(value, Decimal):
+                value = str(value)
+            values.append(value)
+        payload = json.dumps({"ordering": self.ordering, "values": values})
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            values = payload["values"]
+            ordering = tuple(payload["ordering"])
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        # A cursor only continues the ordering it was made for
+        if ordering != tuple(self.ordering) or len(values) != len(ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return values
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, self.encode_cursor(self.page[-1])
+        )
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {
+                    "type": "string",
+                    "nullable": True,
+                    "format": "uri",
+                    "example": "http://api.example.org/accounts/?cursor=eyJvcmRlcmluZyI6",
+                },
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The `next` cursor of the previous page.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": f"Results per page (max {self.max_page_size}).",
+                "schema": {"type": "integer"},
+            },
+            {
+                "name": self.ordering_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Result order.",
+                "schema": {"type": "string", "enum": list(self.get_orderings(view))},
+            },
+        ]